@@ -77,11 +77,13 @@ class DesignSeriesAdmin(admin.ModelAdmin):
         'part_number', 
         'name', 
         'version_count', 
-        'latest_version',
+        'latest_version_display',
         'created_by', 
         'created_at'
     ]
     
+    list_select_related = ['created_by']
+    
     list_filter = ['created_at']
     search_fields = ['part_number', 'name', 'description']
     readonly_fields = ['id', 'created_at', 'updated_at']
@@ -99,23 +101,23 @@ class DesignSeriesAdmin(admin.ModelAdmin):
     inlines = [DesignAssetInline]
     
     def get_queryset(self, request):
-        """Optimize queries with annotation."""
+        """Optimize queries with version annotations and the latest-version join."""
         qs = super().get_queryset(request)
-        return qs.annotate(versions_count=Count('versions'))
+        return qs.with_version_stats().select_related('latest_version')
     
     def version_count(self, obj):
         """Display number of versions."""
-        return obj.versions_count
+        return obj.get_version_count()
     version_count.short_description = 'Versions'
-    version_count.admin_order_field = 'versions_count'
+    version_count.admin_order_field = 'version_count'
     
-    def latest_version(self, obj):
+    def latest_version_display(self, obj):
         """Display latest version number."""
         latest = obj.get_latest_version()
         if latest:
             return f"v{latest.version_number}"
         return "No versions"
-    latest_version.short_description = 'Latest'
+    latest_version_display.short_description = 'Latest'
 
 
 class AssemblyNodeInline(admin.TabularInline):
@@ -151,6 +153,8 @@ class DesignAssetAdmin(admin.ModelAdmin):
         'created_at'
     ]
     
+    list_select_related = ['series', 'uploaded_by']
+    
     list_filter = [
         'classification',
         'status',
@@ -290,6 +294,8 @@ class AssemblyNodeAdmin(admin.ModelAdmin):
         'numchild'
     ]
     
+    list_select_related = ['design_asset__series']
+    
     list_filter = [
         'node_type',
         'design_asset__series'
@@ -355,6 +361,8 @@ class AnalysisJobAdmin(admin.ModelAdmin):
         'duration_display'
     ]
     
+    list_select_related = ['design_asset__series']
+    
     list_filter = [
         'job_type',
         'status',
@@ -447,6 +455,8 @@ class ReviewSessionAdmin(admin.ModelAdmin):
         'created_at'
     ]
     
+    list_select_related = ['design_asset__series', 'created_by']
+    
     list_filter = ['status', 'created_at']
     search_fields = ['title', 'description', 'design_asset__series__part_number']
     
@@ -502,6 +512,8 @@ class MarkupAdmin(admin.ModelAdmin):
         'created_at'
     ]
     
+    list_select_related = ['review_session', 'author']
+    
     list_filter = ['is_resolved', 'created_at']
     search_fields = ['title', 'comment', 'author__username']
     
@@ -5,5 +5,6 @@ class DesignsConfig(AppConfig):
     name = 'designs'
     
     def ready(self):
-        """Import signals when Django starts."""
+        """Import signals and custom lookups when Django starts."""
         import designs.signals  # noqa
+        import designs.lookups  # noqa
@@ -3,6 +3,7 @@ Audit logging utilities for Enginel.
 
 Provides helpers and decorators for CMMC-compliant audit trails.
 """
+import json
 from functools import wraps
 from django.utils import timezone
 from .models import AuditLog
@@ -18,7 +19,8 @@ def get_client_ip(request):
     return ip
 
 
-def log_audit_event(user, action, resource_type, resource_id, request=None, changes=None):
+def log_audit_event(user, action, resource_type, resource_id, request=None, changes=None,
+                    was_successful=None):
     """
     Create an audit log entry.
     
@@ -29,10 +31,15 @@ def log_audit_event(user, action, resource_type, resource_id, request=None, chan
         resource_id: UUID of the resource
         request: HttpRequest object (optional, for IP/user agent)
         changes: Dict with before/after values for updates (optional)
+        was_successful: Whether the audited action succeeded (default:
+            False if changes mention an error, the rule the 0018 backfill used)
     
     Returns:
         AuditLog instance
     """
+    if was_successful is None:
+        was_successful = 'error' not in json.dumps(changes or {}, default=str).lower()
+    
     audit_data = {
         'actor_id': user.id,
         'actor_username': user.username,
@@ -40,6 +47,7 @@ def log_audit_event(user, action, resource_type, resource_id, request=None, chan
         'resource_type': resource_type,
         'resource_id': resource_id,
         'changes': changes or {},
+        'was_successful': was_successful,
     }
     
     if request:
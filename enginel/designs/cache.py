@@ -20,6 +20,10 @@ Cache Invalidation:
 import hashlib
 import json
 import functools
+import threading
+import time
+from collections import OrderedDict
+import orjson
 from typing import Any, Callable, Optional, Union
 from django.core.cache import caches, cache as default_cache
 from django.db.models import Model
@@ -28,6 +32,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Options for orjson-encoded cache values: naive datetimes are treated as
+# UTC and numpy arrays/scalars (e.g. from the BOM table) are serialized natively
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
 
 class CacheManager:
     """
@@ -198,13 +206,57 @@ class CacheManager:
         return value
 
 
+class LocalCache:
+    """
+    Small in-process LRU cache with a per-entry time to live.
+    
+    Sits in front of Redis for values whose keys embed a generation (see
+    get_model_generation): a write changes the key rather than the
+    value, so the short TTL only bounds memory and staleness of the
+    generation itself, and no cross-process invalidation is needed.
+    """
+    
+    def __init__(self, maxsize: int = 2048, ttl: float = 5.0):
+        """
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        """Return the live value for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any):
+        """Store value for key, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
 # Global cache managers
 default_cache_manager = CacheManager('default')
 longterm_cache_manager = CacheManager('longterm')
 
 
 def cache_result(timeout: int = 300, cache_alias: str = 'default', 
-                 key_prefix: str = '', key_func: Optional[Callable] = None):
+                 key_prefix: str = '', key_func: Optional[Callable] = None,
+                 json_encode: bool = False):
     """
     Decorator to cache function results.
     
@@ -213,6 +265,9 @@ def cache_result(timeout: int = 300, cache_alias: str = 'default',
         cache_alias: Cache backend to use
         key_prefix: Prefix for cache keys
         key_func: Optional function to generate custom cache key
+        json_encode: Store the result as orjson bytes instead of pickling it.
+            Faster for large JSON-shaped results; values come back as plain
+            JSON types (e.g. datetimes as ISO strings)
     
     Example:
         >>> @cache_result(timeout=600, key_prefix='geometry')
@@ -238,11 +293,14 @@ def cache_result(timeout: int = 300, cache_alias: str = 'default',
             cached_value = cache_manager.get(cache_key)
             
             if cached_value is not None:
-                return cached_value
+                return orjson.loads(cached_value) if json_encode else cached_value
             
             # Compute and cache result
             result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, timeout)
+            if json_encode:
+                cache_manager.set(cache_key, orjson.dumps(result, option=ORJSON_OPTIONS), timeout)
+            else:
+                cache_manager.set(cache_key, result, timeout)
             
             return result
         
@@ -353,13 +411,15 @@ def invalidate_model_cache(model: Union[Model, type], instance_id: Optional[Any]
     
     model_name = model_class.__name__.lower()
     
-    # Invalidate specific instance
+    # Invalidate specific instance: its cached entries are keyed on the
+    # instance generation, so one increment retires them without a key scan
     if instance_id:
-        pattern = f"{model_name}:{instance_id}:*"
+        bump_model_generation(model_name, instance_id)
         logger.info(f"Invalidating cache for {model_name} instance {instance_id}")
-    else:
-        pattern = f"{model_name}:*"
-        logger.info(f"Invalidating all cache for {model_name}")
+        return
+    
+    pattern = f"{model_name}:*"
+    logger.info(f"Invalidating all cache for {model_name}")
     
     # Invalidate in all cache backends
     for alias in ['default', 'longterm']:
@@ -367,6 +427,89 @@ def invalidate_model_cache(model: Union[Model, type], instance_id: Optional[Any]
         cache_manager.delete_pattern(pattern)
 
 
+def _generation_key(model_name: str, instance_id: Optional[Any] = None) -> str:
+    """Cache key of the generation counter for a model or one instance."""
+    if instance_id is None:
+        return f"{model_name}:generation"
+    return f"{model_name}:{instance_id}:generation"
+
+
+def get_model_generation(model_name: str, instance_id: Optional[Any] = None) -> int:
+    """
+    Get the write generation for a model's list caches, or for one instance.
+    
+    Cache keys include the generation, so bumping it orphans every
+    cached entry keyed on it in O(1) instead of scanning for keys.
+    
+    Args:
+        model_name: Lowercase model name (cache key prefix)
+        instance_id: Optional instance primary key for a per-instance generation
+    
+    Returns:
+        Current generation number
+    """
+    key = _generation_key(model_name, instance_id)
+    try:
+        generation = default_cache.get(key)
+        if generation is None:
+            # Seed with the clock so an evicted counter never restarts at a
+            # value that older cached entries were keyed on
+            default_cache.add(key, time.time_ns(), None)
+            generation = default_cache.get(key, 0)
+        return generation
+    except Exception as e:
+        logger.warning(f"Cache generation read error for {key}: {e}")
+        return 0
+
+
+def bump_model_generation(model_name: str, instance_id: Optional[Any] = None):
+    """
+    Invalidate cached entries for a model, or one instance, by bumping its generation.
+    
+    Args:
+        model_name: Lowercase model name (cache key prefix)
+        instance_id: Optional instance primary key for a per-instance generation
+    """
+    key = _generation_key(model_name, instance_id)
+    try:
+        if not default_cache.add(key, time.time_ns(), None):
+            default_cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Cache generation bump error for {key}: {e}")
+
+
+def bump_model_generations(*targets: tuple):
+    """
+    Bump several generations in one cache round trip.
+    
+    With django-redis, each counter is seeded (SET NX) and incremented in
+    a single non-transactional pipeline. Other backends fall back to one
+    bump_model_generation call per target.
+    
+    Args:
+        *targets: (model_name, instance_id) pairs; instance_id None bumps
+            the model-wide list generation
+    """
+    try:
+        client = default_cache.client
+        redis_client = client.get_client(write=True)
+    except AttributeError:
+        for model_name, instance_id in targets:
+            bump_model_generation(model_name, instance_id)
+        return
+    
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        seed = time.time_ns()
+        for model_name, instance_id in targets:
+            key = client.make_key(_generation_key(model_name, instance_id))
+            pipe.set(key, seed, nx=True)
+            pipe.incr(key)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache generation bump error for {targets}: {e}")
+
+
 class CacheKey:
     """
     Cache key constants and generators for consistent key naming.
@@ -11,9 +11,15 @@ Provides comprehensive FilterSet classes using django-filter for:
 - Markups: Filter by resolved status, author, criticality
 - AuditLogs: Filter by action, resource, user, date ranges
 """
+import copy
+import ipaddress
+from datetime import timedelta
+
 import django_filters
-from django.db.models import Q, Count, Sum
+from django.db.models import Q, Count, Sum, Exists, OuterRef
+from django.utils import timezone
 from .models import (
+    CLEARANCE_RANK,
     CustomUser,
     DesignSeries,
     DesignAsset,
@@ -25,7 +31,101 @@ from .models import (
 )
 
 
-class CustomUserFilter(django_filters.FilterSet):
+# AuditLog.save() stores actions upper-cased, so the actions filter can use
+# plain equality instead of iexact.
+AUDIT_ACTION_CHOICES = (
+    ('CREATE', 'Create'),
+    ('UPDATE', 'Update'),
+    ('DELETE', 'Delete'),
+    ('VIEW', 'View'),
+    ('DOWNLOAD', 'Download'),
+    ('SHARE', 'Share'),
+    ('UPLOAD', 'Upload'),
+    ('APPROVE', 'Approve'),
+    ('REJECT', 'Reject'),
+)
+
+
+def _cutoff(delta):
+    """
+    Return the start of a recent-activity window ending now.
+    
+    Truncated to the minute so identical requests within the same
+    minute produce the same query parameters.
+    """
+    return (timezone.now() - delta).replace(second=0, microsecond=0)
+
+
+class TrigramCharFilter(django_filters.CharFilter):
+    """
+    Case-insensitive partial match backed by a pg_trgm GIN index.
+    
+    Emits the same UPPER(col) LIKE UPPER('%value%') predicate as
+    lookup_expr='icontains'. Only use it on columns whose model declares
+    a gin_trgm_ops index on UPPER(col), so PostgreSQL can answer it with
+    an index scan; other columns use a plain icontains CharFilter.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('lookup_expr', 'icontains')
+        super().__init__(*args, **kwargs)
+
+
+class MegabyteFilter(django_filters.NumberFilter):
+    """
+    Numeric filter that accepts megabytes and filters a byte column.
+    
+    Converts the value before delegating to NumberFilter, so field_name
+    and lookup_expr still describe the lookup.
+    """
+    
+    def filter(self, qs, value):
+        if value is not None:
+            value = int(value * 1024 * 1024)
+        return super().filter(qs, value)
+
+
+class EnginelFilterSet(django_filters.FilterSet):
+    """
+    Base FilterSet that loads the relations its filters traverse.
+    
+    Subclasses list foreign keys in select_related_fields and
+    many-to-many or reverse relations in prefetch_related_fields, so
+    serializing the filtered rows does not issue a query per row.
+    
+    The validation form class depends only on the declared filters, so
+    it is built once per FilterSet class and reused across requests.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    
+    @classmethod
+    def _build_form_class(cls):
+        filters = copy.deepcopy(cls.base_filters)
+        fields = {}
+        for name, filter_ in filters.items():
+            filter_.model = cls._meta.model
+            fields[name] = filter_.field
+        return type(f'{cls.__name__}Form', (cls._meta.form,), fields)
+    
+    def get_form_class(self):
+        cls = type(self)
+        # Look up on the class itself so subclasses never reuse a parent's form
+        form_class = cls.__dict__.get('_form_class')
+        if form_class is None:
+            form_class = cls._build_form_class()
+            cls._form_class = form_class
+        return form_class
+    
+    def filter_queryset(self, queryset):
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return super().filter_queryset(queryset)
+
+
+class CustomUserFilter(EnginelFilterSet):
     """
     Advanced filtering for Users.
     
@@ -37,10 +137,10 @@ class CustomUserFilter(django_filters.FilterSet):
     - joined_after/joined_before: Account creation date range
     """
     # Text search
-    username = django_filters.CharFilter(lookup_expr='icontains')
-    email = django_filters.CharFilter(lookup_expr='icontains')
-    first_name = django_filters.CharFilter(lookup_expr='icontains')
-    last_name = django_filters.CharFilter(lookup_expr='icontains')
+    username = TrigramCharFilter()
+    email = TrigramCharFilter()
+    first_name = TrigramCharFilter()
+    last_name = TrigramCharFilter()
     organization = django_filters.CharFilter(
         field_name='organization',
         lookup_expr='icontains'
@@ -91,23 +191,12 @@ class CustomUserFilter(django_filters.FilterSet):
     
     def filter_min_clearance(self, queryset, name, value):
         """Filter users with at least the specified clearance level."""
-        clearance_hierarchy = {
-            'UNCLASSIFIED': 0,
-            'CONFIDENTIAL': 1,
-            'SECRET': 2,
-            'TOP_SECRET': 3,
-        }
-        
-        min_level = clearance_hierarchy.get(value, 0)
-        allowed_clearances = [
-            level for level, rank in clearance_hierarchy.items()
-            if rank >= min_level
-        ]
-        
-        return queryset.filter(security_clearance_level__in=allowed_clearances)
+        return queryset.filter(
+            security_clearance_rank__gte=CLEARANCE_RANK.get(value, 0)
+        )
 
 
-class DesignSeriesFilter(django_filters.FilterSet):
+class DesignSeriesFilter(EnginelFilterSet):
     """
     Advanced filtering for DesignSeries (part numbers).
     
@@ -121,9 +210,9 @@ class DesignSeriesFilter(django_filters.FilterSet):
     - date ranges: created_at, updated_at filters
     """
     # Text search
-    part_number = django_filters.CharFilter(lookup_expr='icontains')
-    name = django_filters.CharFilter(lookup_expr='icontains')
-    description = django_filters.CharFilter(lookup_expr='icontains')
+    part_number = TrigramCharFilter()
+    name = TrigramCharFilter()
+    description = TrigramCharFilter()
     
     # Status
     status = django_filters.ChoiceFilter(
@@ -157,10 +246,7 @@ class DesignSeriesFilter(django_filters.FilterSet):
     
     # Relationships
     created_by = django_filters.NumberFilter(field_name='created_by__id')
-    created_by_username = django_filters.CharFilter(
-        field_name='created_by__username',
-        lookup_expr='icontains'
-    )
+    created_by_username = TrigramCharFilter(field_name='created_by__username')
     
     # Date range filters
     created_after = django_filters.DateTimeFilter(
@@ -180,6 +266,8 @@ class DesignSeriesFilter(django_filters.FilterSet):
         lookup_expr='lte'
     )
     
+    select_related_fields = ('created_by',)
+    
     class Meta:
         model = DesignSeries
         fields = [
@@ -190,26 +278,45 @@ class DesignSeriesFilter(django_filters.FilterSet):
             'requires_itar_compliance',
         ]
     
+    def filter_queryset(self, queryset):
+        """
+        Annotate the version count once before the version filters run.
+        
+        min_versions and max_versions share a single Count('versions')
+        annotation instead of each adding its own join and GROUP BY.
+        Querysets that already carry the annotation are left as is.
+        """
+        cleaned_data = self.form.cleaned_data
+        needs_version_count = (
+            cleaned_data.get('min_versions') is not None
+            or cleaned_data.get('max_versions') is not None
+        )
+        if needs_version_count and 'version_count' not in queryset.query.annotations:
+            queryset = queryset.annotate(version_count=Count('versions'))
+        return super().filter_queryset(queryset)
+    
     def filter_has_versions(self, queryset, name, value):
         """Filter series that have or don't have versions."""
+        if 'version_count' in queryset.query.annotations:
+            # Reuse the count already being grouped instead of a second scan
+            if value:
+                return queryset.filter(version_count__gt=0)
+            return queryset.filter(version_count=0)
+        has_versions = Exists(DesignAsset.objects.filter(series=OuterRef('pk')))
         if value:
-            return queryset.filter(versions__isnull=False).distinct()
-        return queryset.filter(versions__isnull=True)
+            return queryset.filter(has_versions)
+        return queryset.filter(~has_versions)
     
     def filter_min_versions(self, queryset, name, value):
         """Filter series with at least N versions."""
-        return queryset.annotate(
-            version_count=Count('versions')
-        ).filter(version_count__gte=value)
+        return queryset.filter(version_count__gte=value)
     
     def filter_max_versions(self, queryset, name, value):
         """Filter series with at most N versions."""
-        return queryset.annotate(
-            version_count=Count('versions')
-        ).filter(version_count__lte=value)
+        return queryset.filter(version_count__lte=value)
 
 
-class DesignAssetFilter(django_filters.FilterSet):
+class DesignAssetFilter(EnginelFilterSet):
     """
     Advanced filtering for DesignAssets (CAD files).
     
@@ -223,21 +330,16 @@ class DesignAssetFilter(django_filters.FilterSet):
     - part_number: Filter by parent series part number
     - revision: Filter by version/revision
     - uploaded_by: Filter by uploader user ID
+    - tags: Comma-separated tags, all of which must be present
     - date ranges: created_at, last_modified filters
     """
     # Text search
-    filename = django_filters.CharFilter(lookup_expr='icontains')
+    filename = TrigramCharFilter()
     revision = django_filters.CharFilter(lookup_expr='icontains')
     
     # Part number from parent series
-    part_number = django_filters.CharFilter(
-        field_name='series__part_number',
-        lookup_expr='icontains'
-    )
-    series_name = django_filters.CharFilter(
-        field_name='series__name',
-        lookup_expr='icontains'
-    )
+    part_number = TrigramCharFilter(field_name='series__part_number')
+    series_name = TrigramCharFilter(field_name='series__name')
     
     # File attributes
     file_format = django_filters.CharFilter(lookup_expr='iexact')
@@ -281,12 +383,14 @@ class DesignAssetFilter(django_filters.FilterSet):
     )
     
     # File size in MB for convenience
-    min_file_size_mb = django_filters.NumberFilter(
-        method='filter_min_size_mb',
+    min_file_size_mb = MegabyteFilter(
+        field_name='file_size',
+        lookup_expr='gte',
         label='Minimum file size (MB)'
     )
-    max_file_size_mb = django_filters.NumberFilter(
-        method='filter_max_size_mb',
+    max_file_size_mb = MegabyteFilter(
+        field_name='file_size',
+        lookup_expr='lte',
         label='Maximum file size (MB)'
     )
     
@@ -341,13 +445,16 @@ class DesignAssetFilter(django_filters.FilterSet):
     
     # Relationships
     uploaded_by = django_filters.NumberFilter(field_name='uploaded_by__id')
-    uploaded_by_username = django_filters.CharFilter(
-        field_name='uploaded_by__username',
-        lookup_expr='icontains'
-    )
+    uploaded_by_username = TrigramCharFilter(field_name='uploaded_by__username')
     
     series_id = django_filters.UUIDFilter(field_name='series__id')
     
+    # Tag containment (served by the da_tags_gin index)
+    tags = django_filters.CharFilter(
+        method='filter_tags',
+        label='Tags (comma-separated, all must match)'
+    )
+    
     # Date range filters
     uploaded_after = django_filters.DateTimeFilter(
         field_name='created_at',
@@ -366,6 +473,8 @@ class DesignAssetFilter(django_filters.FilterSet):
         lookup_expr='lte'
     )
     
+    select_related_fields = ('series', 'uploaded_by')
+    
     class Meta:
         model = DesignAsset
         fields = [
@@ -376,40 +485,33 @@ class DesignAssetFilter(django_filters.FilterSet):
             'revision',
         ]
     
-    def filter_min_size_mb(self, queryset, name, value):
-        """Filter by minimum file size in MB."""
-        bytes_value = value * 1024 * 1024
-        return queryset.filter(file_size__gte=bytes_value)
-    
-    def filter_max_size_mb(self, queryset, name, value):
-        """Filter by maximum file size in MB."""
-        bytes_value = value * 1024 * 1024
-        return queryset.filter(file_size__lte=bytes_value)
-    
     def filter_has_geometry(self, queryset, name, value):
         """Filter assets with or without geometry metadata."""
-        if value:
-            return queryset.filter(
-                Q(volume_mm3__isnull=False) | Q(surface_area_mm2__isnull=False)
-            )
-        return queryset.filter(
-            volume_mm3__isnull=True,
-            surface_area_mm2__isnull=True
-        )
+        return queryset.filter(has_geometry_flag=value)
     
     def filter_has_bom(self, queryset, name, value):
         """Filter assets with or without BOM data."""
+        has_bom = Exists(AssemblyNode.objects.filter(design_asset=OuterRef('pk')))
         if value:
-            return queryset.filter(bom_root__isnull=False)
-        return queryset.filter(bom_root__isnull=True)
+            return queryset.filter(has_bom)
+        return queryset.filter(~has_bom)
+    
+    def filter_tags(self, queryset, name, value):
+        """Filter assets whose tags contain every comma-separated tag."""
+        tags = [tag.strip() for tag in value.split(',') if tag.strip()]
+        if not tags:
+            return queryset
+        return queryset.filter(tags__contains=tags)
 
 
-class AssemblyNodeFilter(django_filters.FilterSet):
+class AssemblyNodeFilter(EnginelFilterSet):
     """
     Advanced filtering for AssemblyNodes (BOM tree).
     
     Filters:
-    - part_name/part_number: Case-insensitive partial match
+    - part_name/part_number: Case-insensitive partial match (part_name
+      searches the node name)
+    - material: Partial match on component_metadata['material']
     - node_type: component, assembly, reference, virtual
     - has_children: Filter nodes with/without child parts
     - depth_level: Filter by hierarchy depth
@@ -417,10 +519,12 @@ class AssemblyNodeFilter(django_filters.FilterSet):
     - design_asset: Filter by parent design asset
     """
     # Text search
-    part_name = django_filters.CharFilter(lookup_expr='icontains')
-    part_number = django_filters.CharFilter(lookup_expr='icontains')
-    material = django_filters.CharFilter(lookup_expr='icontains')
-    description = django_filters.CharFilter(lookup_expr='icontains')
+    part_name = TrigramCharFilter(field_name='name')
+    part_number = TrigramCharFilter()
+    material = django_filters.CharFilter(
+        field_name='component_metadata__material',
+        lookup_expr='icontains'
+    )
     
     # Node type
     node_type = django_filters.ChoiceFilter(
@@ -495,7 +599,7 @@ class AssemblyNodeFilter(django_filters.FilterSet):
         return queryset.filter(depth__gt=1)
 
 
-class AnalysisJobFilter(django_filters.FilterSet):
+class AnalysisJobFilter(EnginelFilterSet):
     """
     Advanced filtering for AnalysisJobs (Celery tasks).
     
@@ -545,36 +649,22 @@ class AnalysisJobFilter(django_filters.FilterSet):
     
     # Duration filter (in seconds)
     min_duration = django_filters.NumberFilter(
-        method='filter_min_duration',
+        field_name='duration_seconds',
+        lookup_expr='gte',
         label='Minimum duration (seconds)'
     )
     max_duration = django_filters.NumberFilter(
-        method='filter_max_duration',
+        field_name='duration_seconds',
+        lookup_expr='lte',
         label='Maximum duration (seconds)'
     )
     
     class Meta:
         model = AnalysisJob
         fields = ['task_name', 'status']
-    
-    def filter_min_duration(self, queryset, name, value):
-        """Filter tasks by minimum execution time."""
-        return queryset.filter(
-            completed_at__isnull=False
-        ).extra(
-            where=[f"EXTRACT(EPOCH FROM (completed_at - created_at)) >= {value}"]
-        )
-    
-    def filter_max_duration(self, queryset, name, value):
-        """Filter tasks by maximum execution time."""
-        return queryset.filter(
-            completed_at__isnull=False
-        ).extra(
-            where=[f"EXTRACT(EPOCH FROM (completed_at - created_at)) <= {value}"]
-        )
 
 
-class ReviewSessionFilter(django_filters.FilterSet):
+class ReviewSessionFilter(EnginelFilterSet):
     """
     Advanced filtering for ReviewSessions.
     
@@ -627,16 +717,24 @@ class ReviewSessionFilter(django_filters.FilterSet):
         lookup_expr='lte'
     )
     
+    select_related_fields = ('created_by', 'design_asset')
+    prefetch_related_fields = ('reviewers',)
+    
     class Meta:
         model = ReviewSession
         fields = ['title', 'status']
     
     def filter_has_reviewer(self, queryset, name, value):
         """Filter sessions with specific reviewer."""
-        return queryset.filter(reviewers__id=value)
+        # Probe the M2M through table only; its (session, user) unique
+        # index answers this without joining users or needing DISTINCT
+        through = ReviewSession.reviewers.through
+        return queryset.filter(Exists(
+            through.objects.filter(reviewsession_id=OuterRef('pk'), customuser_id=value)
+        ))
 
 
-class MarkupFilter(django_filters.FilterSet):
+class MarkupFilter(EnginelFilterSet):
     """
     Advanced filtering for Markups (3D annotations).
     
@@ -668,10 +766,7 @@ class MarkupFilter(django_filters.FilterSet):
     # Relationships
     review_session = django_filters.UUIDFilter(field_name='review_session__id')
     author = django_filters.NumberFilter(field_name='author__id')
-    author_username = django_filters.CharFilter(
-        field_name='author__username',
-        lookup_expr='icontains'
-    )
+    author_username = TrigramCharFilter(field_name='author__username')
     
     # Date range filters
     created_after = django_filters.DateTimeFilter(
@@ -691,12 +786,14 @@ class MarkupFilter(django_filters.FilterSet):
         lookup_expr='lte'
     )
     
+    select_related_fields = ('author', 'review_session')
+    
     class Meta:
         model = Markup
         fields = ['title', 'is_resolved', 'priority']
 
 
-class AuditLogFilter(django_filters.FilterSet):
+class AuditLogFilter(EnginelFilterSet):
     """
     Advanced filtering for AuditLogs (compliance trail).
     
@@ -715,28 +812,17 @@ class AuditLogFilter(django_filters.FilterSet):
     # Action choices (multiple)
     actions = django_filters.MultipleChoiceFilter(
         field_name='action',
-        choices=[
-            ('CREATE', 'Create'),
-            ('UPDATE', 'Update'),
-            ('DELETE', 'Delete'),
-            ('VIEW', 'View'),
-            ('DOWNLOAD', 'Download'),
-            ('SHARE', 'Share'),
-            ('UPLOAD', 'Upload'),
-            ('APPROVE', 'Approve'),
-            ('REJECT', 'Reject'),
-        ],
-        lookup_expr='iexact',
+        choices=AUDIT_ACTION_CHOICES,
         label='Actions'
     )
     
     # Resource identification
-    resource_type = django_filters.CharFilter(lookup_expr='icontains')
-    resource_id = django_filters.CharFilter(lookup_expr='exact')
+    resource_type = TrigramCharFilter()
+    resource_id = django_filters.UUIDFilter()
     
     # Actor identification
     actor_id = django_filters.NumberFilter()
-    actor_username = django_filters.CharFilter(lookup_expr='icontains')
+    actor_username = TrigramCharFilter()
     
     # Network/security
     ip_address = django_filters.CharFilter(lookup_expr='exact')
@@ -785,43 +871,31 @@ class AuditLogFilter(django_filters.FilterSet):
         ]
     
     def filter_ip_range(self, queryset, name, value):
-        """Filter by IP range (CIDR notation)."""
-        # Simple implementation - could be enhanced with ipaddress module
-        if '/' in value:
-            prefix = value.split('/')[0]
-            base = '.'.join(prefix.split('.')[:-1])
-            return queryset.filter(ip_address__startswith=base)
-        return queryset.filter(ip_address=value)
+        """Filter by IP range (CIDR notation); a bare address matches exactly."""
+        try:
+            network = ipaddress.ip_network(value, strict=False)
+        except ValueError:
+            return queryset.none()
+        return queryset.filter(ip_address__net_contained_by=str(network))
     
     def filter_success(self, queryset, name, value):
-        """Filter by success status (no errors in details)."""
-        if value:
-            return queryset.exclude(details__contains='error')
-        return queryset.filter(details__contains='error')
+        """Filter by success status."""
+        return queryset.filter(was_successful=value)
     
     def filter_last_hour(self, queryset, name, value):
         """Filter to last hour of activity."""
         if value:
-            from django.utils import timezone
-            from datetime import timedelta
-            cutoff = timezone.now() - timedelta(hours=1)
-            return queryset.filter(timestamp__gte=cutoff)
+            return queryset.filter(timestamp__gte=_cutoff(timedelta(hours=1)))
         return queryset
     
     def filter_last_day(self, queryset, name, value):
         """Filter to last 24 hours of activity."""
         if value:
-            from django.utils import timezone
-            from datetime import timedelta
-            cutoff = timezone.now() - timedelta(days=1)
-            return queryset.filter(timestamp__gte=cutoff)
+            return queryset.filter(timestamp__gte=_cutoff(timedelta(days=1)))
         return queryset
     
     def filter_last_week(self, queryset, name, value):
         """Filter to last 7 days of activity."""
         if value:
-            from django.utils import timezone
-            from datetime import timedelta
-            cutoff = timezone.now() - timedelta(days=7)
-            return queryset.filter(timestamp__gte=cutoff)
+            return queryset.filter(timestamp__gte=_cutoff(timedelta(days=7)))
         return queryset
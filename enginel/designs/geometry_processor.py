@@ -10,24 +10,497 @@ This module provides functions to extract geometric metadata from CAD files:
 Expensive operations are cached using longterm cache (1 hour).
 """
 
+import copy
+import functools
+import hashlib
+import importlib.util
 import logging
-from typing import Dict, Any, List, Tuple
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
 from pathlib import Path
 import json
-from designs.cache import cache_result, CacheKey, longterm_cache_manager
-
-try:
-    import cadquery as cq
-    from OCP.BRepCheck import BRepCheck_Analyzer
-    from OCP.GProp import GProp_GProps
-    from OCP.BRepGProp import BRepGProp
-    GEOMETRY_AVAILABLE = True
-except ImportError:
-    GEOMETRY_AVAILABLE = False
-    logging.warning("CadQuery/OCP not available. Geometry processing will be disabled.")
+import orjson
+from django.conf import settings
+from designs.cache import cache_result, CacheKey, longterm_cache_manager, ORJSON_OPTIONS
 
 logger = logging.getLogger(__name__)
 
+# CadQuery pulls in all of OCP, which is slow to import and large once
+# resident, so the geometry stack is imported on first use (see
+# _load_geometry_modules). Availability is decided from the installed
+# packages without importing them.
+GEOMETRY_AVAILABLE = all(
+    importlib.util.find_spec(package) is not None for package in ('numpy', 'cadquery', 'OCP')
+)
+if not GEOMETRY_AVAILABLE:
+    logging.warning("CadQuery/OCP not available. Geometry processing will be disabled.")
+
+_geometry_loaded = False
+
+# Names bound by _load_geometry_modules, also served by the module __getattr__
+_GEOMETRY_NAMES = frozenset({
+    'np', 'cq', 'BRepCheck_Analyzer', 'GProp_GProps', 'BRepGProp', 'Bnd_Box', 'BRepBndLib',
+    'OSD_ThreadPool', 'TopAbs_SOLID', 'TopAbs_SHELL', 'TopAbs_FACE', 'TopAbs_EDGE',
+    'TopAbs_VERTEX', 'TopExp', 'TopTools_IndexedMapOfShape',
+    'TopTools_IndexedDataMapOfShapeListOfShape', 'TopoDS', 'TopLoc_Location',
+    'BRep_Tool', 'BRepBuilderAPI_Sewing', 'BRepMesh_IncrementalMesh', 'StlAPI_Writer',
+})
+
+
+def _load_geometry_modules():
+    """
+    Import numpy, CadQuery and the OCP classes into module globals.
+    
+    Called before any geometry work; later calls return immediately.
+    Sets GEOMETRY_AVAILABLE to False if an import fails.
+    """
+    global _geometry_loaded, GEOMETRY_AVAILABLE
+    global np, cq, BRepCheck_Analyzer, GProp_GProps, BRepGProp, Bnd_Box, BRepBndLib
+    global OSD_ThreadPool, TopAbs_SOLID, TopAbs_SHELL, TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX
+    global TopExp, TopTools_IndexedMapOfShape, TopTools_IndexedDataMapOfShapeListOfShape
+    global TopoDS, TopLoc_Location, BRep_Tool, BRepBuilderAPI_Sewing
+    global BRepMesh_IncrementalMesh, StlAPI_Writer
+    if _geometry_loaded or not GEOMETRY_AVAILABLE:
+        return
+    
+    try:
+        import numpy as np
+        import cadquery as cq
+        from OCP.BRepCheck import BRepCheck_Analyzer
+        from OCP.GProp import GProp_GProps
+        from OCP.BRepGProp import BRepGProp
+        from OCP.Bnd import Bnd_Box
+        from OCP.BRepBndLib import BRepBndLib
+        from OCP.OSD import OSD_ThreadPool
+        from OCP.TopAbs import TopAbs_SOLID, TopAbs_SHELL, TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX
+        from OCP.TopExp import TopExp
+        from OCP.TopTools import TopTools_IndexedMapOfShape, TopTools_IndexedDataMapOfShapeListOfShape
+        from OCP.TopoDS import TopoDS
+        from OCP.TopLoc import TopLoc_Location
+        from OCP.BRep import BRep_Tool
+        from OCP.BRepBuilderAPI import BRepBuilderAPI_Sewing
+        from OCP.BRepMesh import BRepMesh_IncrementalMesh
+        from OCP.StlAPI import StlAPI_Writer
+        _geometry_loaded = True
+    except ImportError:
+        GEOMETRY_AVAILABLE = False
+        logging.warning("CadQuery/OCP not available. Geometry processing will be disabled.")
+
+
+def __getattr__(name):
+    # PEP 562: resolve geometry names for importers of this module
+    if name in _GEOMETRY_NAMES:
+        _load_geometry_modules()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Assemblies with fewer solids are described serially
+BOM_PARALLEL_THRESHOLD = 4
+
+# Face count above which the standard (looser, cheaper) bounding box
+# is used instead of BRepBndLib.AddOptimal
+OPTIMAL_BBOX_FACE_LIMIT = 5000
+
+# Edge count above which design rule checks warn about performance
+HIGH_EDGE_COUNT_THRESHOLD = 10000
+
+# Whether the shared OpenCASCADE thread pool has been sized for meshing
+_mesh_pool_initialized = False
+
+# Bump when the process_all output format changes to orphan old cache files
+CAD_CACHE_SCHEMA_VERSION = '1'
+
+# Read size when hashing CAD files for the on-disk result cache
+CAD_CACHE_HASH_CHUNK = 1 << 20
+
+# Successful process_all results kept in memory per worker, by content key
+CAD_MEMORY_CACHE_SIZE = 64
+_cad_memory_cache = OrderedDict()
+_cad_memory_cache_lock = threading.Lock()
+
+# Bytes scanned for unit declarations at the start of a STEP file
+UNIT_SCAN_BYTES = 50000
+
+# SI prefix + METRE within the same entity, or a bare unit name
+_UNIT_RE = re.compile(rb'(MILLI|CENTI|MICRO|KILO)[^;]{0,100}?METRE|(INCH|FOOT|METRE)', re.IGNORECASE)
+
+_UNIT_NAMES = {
+    b'MILLI': 'mm',
+    b'CENTI': 'cm',
+    b'MICRO': 'um',
+    b'KILO': 'km',
+    b'INCH': 'in',
+    b'FOOT': 'ft',
+    b'METRE': 'm',
+}
+
+# Most specific first; a bare METRE only wins if nothing else was declared
+_UNIT_PRIORITY = ('mm', 'cm', 'um', 'km', 'in', 'ft', 'm')
+
+# Matches "#12 = PRODUCT('name'". The pattern starts at the PRODUCT literal
+# so the regex engine can skip ahead with a fast substring search instead of
+# attempting a match at every '#'; the entity prefix is checked separately.
+_PRODUCT_RE = re.compile(rb"PRODUCT\s*\(\s*'([^']+)'")
+_ENTITY_ASSIGN_RE = re.compile(rb"#\d+\s*=\s*\Z")
+_ENTITY_ASSIGN_LOOKBEHIND = 32
+
+
+def _init_mesh_thread_pool():
+    """
+    Size OpenCASCADE's default thread pool once per process.
+    
+    Parallel BRepMesh runs its per-face work on this pool; the first call
+    to DefaultPool fixes its size. Uses settings.GEOMETRY_MESH_THREADS,
+    where 0 means one thread per logical CPU.
+    """
+    global _mesh_pool_initialized
+    if _mesh_pool_initialized:
+        return
+    
+    threads = getattr(settings, 'GEOMETRY_MESH_THREADS', 0) or -1
+    OSD_ThreadPool.DefaultPool_s(threads)
+    _mesh_pool_initialized = True
+
+
+@functools.lru_cache(maxsize=1024)
+def _scan_step_units(path: str, size: int, mtime_ns: int) -> str:
+    """
+    Find the declared length unit in the first UNIT_SCAN_BYTES of a STEP file.
+    
+    Memoized on (path, size, mtime_ns), so a file is rescanned only after
+    it changes on disk.
+    
+    Args:
+        path: Path to the STEP file
+        size: File size in bytes
+        mtime_ns: File modification time in nanoseconds
+    
+    Returns:
+        Unit string ('mm', 'in', 'm', etc.) or '' if none is declared
+    """
+    if not size:
+        return ''
+    
+    # Scan the mapped prefix once; no decoded or upper-cased copy is made.
+    # Units are declared in DATA-section entities such as
+    # #XX = ( LENGTH_UNIT() NAMED_UNIT(*) SI_UNIT(.MILLI.,.METRE.) );
+    found = set()
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), min(UNIT_SCAN_BYTES, size), access=mmap.ACCESS_READ) as content:
+            for match in _UNIT_RE.finditer(content):
+                unit = _UNIT_NAMES[match.group(match.lastindex).upper()]
+                found.add(unit)
+                if unit == _UNIT_PRIORITY[0]:
+                    break
+    
+    for unit in _UNIT_PRIORITY:
+        if unit in found:
+            return unit
+    return ''
+
+
+@functools.lru_cache(maxsize=1024)
+def _scan_step_product_names(path: str, size: int, mtime_ns: int) -> Tuple[Tuple[int, str], ...]:
+    """
+    Collect PRODUCT names from a STEP file.
+    
+    Memoized on (path, size, mtime_ns) like _scan_step_units.
+    
+    Args:
+        path: Path to the STEP file
+        size: File size in bytes
+        mtime_ns: File modification time in nanoseconds
+    
+    Returns:
+        Tuple of (component index, name) pairs, skipping placeholder names
+    """
+    # mmap cannot map an empty file
+    if not size:
+        return ()
+    
+    names = []
+    with open(path, 'rb') as f:
+        # Match PRODUCT definitions against the mapped file so large
+        # STEP files are never read or decoded in full. Mapping the stat'ed
+        # size keeps the scan consistent with the memo key.
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as content:
+            # Entities live between DATA; and the section's closing ENDSEC;,
+            # so the header and trailer are never scanned
+            data_start = content.find(b'DATA;')
+            data_end = content.rfind(b'ENDSEC;')
+            if data_start < 0:
+                data_start = 0
+            if data_end < data_start:
+                data_end = len(content)
+            matches = (
+                match for match in _PRODUCT_RE.finditer(content, data_start, data_end)
+                if _ENTITY_ASSIGN_RE.search(
+                    content, max(0, match.start() - _ENTITY_ASSIGN_LOOKBEHIND), match.start()
+                )
+            )
+            for idx, match in enumerate(matches):
+                name = match.group(1).decode('utf-8', 'ignore')
+                if name and name not in ['', 'UNNAMED', 'UNKNOWN']:
+                    names.append((idx, name))
+    return tuple(names)
+
+
+def _classify_edges(shape) -> Tuple[int, int]:
+    """
+    Count free and non-manifold edges from the edge-to-face adjacency map.
+    
+    In a closed manifold shell every edge bounds exactly two faces (a seam
+    edge bounds the same face twice). Degenerated edges, such as the pole
+    of a sphere, have no length and are skipped.
+    
+    Args:
+        shape: TopoDS_Shape to analyze
+    
+    Returns:
+        Tuple of (free edge count, non-manifold edge count)
+    """
+    edge_faces = TopTools_IndexedDataMapOfShapeListOfShape()
+    TopExp.MapShapesAndAncestors_s(shape, TopAbs_EDGE, TopAbs_FACE, edge_faces)
+    
+    free_edges = 0
+    non_manifold_edges = 0
+    for i in range(1, edge_faces.Extent() + 1):
+        if BRep_Tool.Degenerated_s(TopoDS.Edge_s(edge_faces.FindKey(i))):
+            continue
+        face_count = edge_faces.FindFromIndex(i).Extent()
+        if face_count < 2:
+            free_edges += 1
+        elif face_count > 2:
+            non_manifold_edges += 1
+    return free_edges, non_manifold_edges
+
+
+def _map_ordered(func: Callable, items) -> List[Any]:
+    """
+    Apply func to each item, in a thread pool when there are enough items.
+    
+    Results keep the order of items. Fewer than BOM_PARALLEL_THRESHOLD
+    items are processed serially, where thread start-up would cost more
+    than it saves.
+    
+    Args:
+        func: Callable taking one item
+        items: Sequence of items
+    
+    Returns:
+        List of results in item order
+    """
+    if len(items) < BOM_PARALLEL_THRESHOLD:
+        return [func(item) for item in items]
+    
+    max_workers = min(os.cpu_count() or 1, len(items))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _map_subshapes(shape, shape_type):
+    """
+    Collect the distinct sub-shapes of a given type in one traversal.
+    
+    Args:
+        shape: TopoDS_Shape to explore
+        shape_type: TopAbs shape type to collect
+    
+    Returns:
+        TopTools_IndexedMapOfShape of the sub-shapes (1-based)
+    """
+    shape_map = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(shape, shape_type, shape_map)
+    return shape_map
+
+
+def _map_keys(shape_map) -> List[Any]:
+    """
+    List the shapes of an indexed map in index order.
+    
+    Args:
+        shape_map: TopTools_IndexedMapOfShape
+    
+    Returns:
+        List of shapes
+    """
+    return [shape_map.FindKey(i) for i in range(1, shape_map.Extent() + 1)]
+
+
+def _measure_part(solid, detail_level: str) -> Dict[str, Any]:
+    """
+    Compute the location-independent properties of an unlocated solid.
+    
+    Args:
+        solid: TopoDS_Solid with an identity location
+        detail_level: 'full' or 'topology' (see extract_bom_structure)
+    
+    Returns:
+        Dictionary with topology and, for 'full', volume, surface area
+        and the centre of mass (gp_Pnt) in the part's own coordinates
+    """
+    intrinsic = {'topology': _part_topology(solid)}
+    if detail_level == 'topology':
+        return intrinsic
+    
+    volume_props = GProp_GProps()
+    surface_props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(solid, volume_props)
+    BRepGProp.SurfaceProperties_s(solid, surface_props)
+    
+    intrinsic.update({
+        'volume': volume_props.Mass(),
+        'surface_area': surface_props.Mass(),
+        'center_of_mass': volume_props.CentreOfMass(),
+    })
+    return intrinsic
+
+
+def _part_topology(solid) -> Dict[str, int]:
+    """
+    Count topology elements for a specific component.
+    
+    Args:
+        solid: TopoDS_Solid to analyze
+    
+    Returns:
+        Dictionary with topology counts
+    """
+    try:
+        return {
+            'faces': _count_subshapes(solid, TopAbs_FACE),
+            'edges': _count_subshapes(solid, TopAbs_EDGE),
+            'vertices': _count_subshapes(solid, TopAbs_VERTEX)
+        }
+    except Exception as e:
+        logger.debug(f"Failed to count topology: {e}")
+        return {'faces': 0, 'edges': 0, 'vertices': 0}
+
+
+def _count_subshapes(shape, shape_type) -> int:
+    """
+    Count the distinct sub-shapes of a given type.
+    
+    The map is filled by a single OpenCASCADE traversal, so the count
+    costs one Python-to-C++ call instead of one per sub-shape. Shared
+    sub-shapes (an edge bounding two faces) are counted once.
+    
+    Args:
+        shape: TopoDS_Shape to explore
+        shape_type: TopAbs shape type to count
+    
+    Returns:
+        Number of distinct sub-shapes
+    """
+    return _map_subshapes(shape, shape_type).Extent()
+
+
+@functools.lru_cache(maxsize=None)
+def _bom_dtype():
+    """
+    Record layout of one BOM component.
+    
+    Built on first use so the module still imports without numpy.
+    """
+    return np.dtype([
+        ('index', 'i4'),
+        ('volume', 'f8'),
+        ('surface_area', 'f8'),
+        ('mass', 'f8'),
+        ('com', '3f8'),
+        ('bbox_min', '3f8'),
+        ('bbox_max', '3f8'),
+        ('faces', 'i4'),
+        ('edges', 'i4'),
+        ('vertices', 'i4'),
+    ])
+
+
+def _bounding_box_dict(xmin, ymin, zmin, xmax, ymax, zmax) -> Dict[str, Any]:
+    """Format bounding box extents the way metadata and BOM nodes store them."""
+    return {
+        'xmin': float(xmin), 'xmax': float(xmax),
+        'ymin': float(ymin), 'ymax': float(ymax),
+        'zmin': float(zmin), 'zmax': float(zmax),
+        'dimensions': {
+            'length': float(xmax - xmin),
+            'width': float(ymax - ymin),
+            'height': float(zmax - zmin)
+        }
+    }
+
+
+class BOMTable:
+    """
+    Assembly components stored column-wise.
+    
+    Numeric values live in one structured numpy array (see _bom_dtype)
+    and names in a parallel list, which keeps large assemblies compact and
+    lets aggregates run as array reductions. to_dict_list() rebuilds the
+    per-component dictionaries for JSON metadata and BOM node creation.
+    """
+    
+    def __init__(self, rows, names: List[str], measured: bool = True):
+        """
+        Args:
+            rows: Structured array with the _bom_dtype layout
+            names: Component names, one per row
+            measured: False when rows carry topology counts only
+        """
+        self.rows = rows
+        self.names = names
+        self.measured = measured
+    
+    @classmethod
+    def empty(cls) -> 'BOMTable':
+        """Return a table with no components."""
+        return cls([], [], measured=False)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def to_dict_list(self, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Convert rows to the per-component dictionary format.
+        
+        Args:
+            limit: Convert only the first limit components
+        
+        Returns:
+            List of component dictionaries
+        """
+        if not len(self):
+            return []
+        
+        components = []
+        for row, name in zip(self.rows[:limit].tolist(), self.names[:limit]):
+            index, volume, surface_area, mass, com, bbox_min, bbox_max, faces, edges, vertices = row
+            component = {
+                'index': index,
+                'name': name,
+                'part_number': f"PN-{index + 1:04d}",
+                'quantity': 1,
+                'node_type': 'PART',
+                'topology': {'faces': faces, 'edges': edges, 'vertices': vertices},
+            }
+            if self.measured:
+                component.update({
+                    'volume': volume,
+                    'surface_area': surface_area,
+                    'mass': mass,
+                    'center_of_mass': dict(zip('xyz', com.tolist())),
+                    'bounding_box': _bounding_box_dict(*bbox_min, *bbox_max),
+                })
+            components.append(component)
+        return components
+
 
 class GeometryProcessor:
     """Processes STEP/IGES files to extract geometric metadata."""
@@ -39,11 +512,23 @@ class GeometryProcessor:
         Args:
             file_path: Path to STEP or IGES file
         """
+        _load_geometry_modules()
         if not GEOMETRY_AVAILABLE:
             raise ImportError("CadQuery/OCP not installed. Install with: pip install cadquery")
         
         self.file_path = Path(file_path)
         self.shape = None
+        self._ocp_shape = None
+        
+        # (linear, angular) deflection of the triangulation attached to the shape
+        self._mesh_params = None
+        
+        # Results memoized per processor; the loaded shape never changes
+        self._mass_props = {}
+        self._topology = None
+        self._bom = {}
+        self._subshape_maps = {}
+        
         self._load_file()
     
     def _load_file(self):
@@ -58,33 +543,46 @@ class GeometryProcessor:
             else:
                 raise ValueError(f"Unsupported file format: {file_ext}")
             
+            # Unwrap once to the OCP shape used by all direct API calls
+            solid = self.shape.val() if hasattr(self.shape, 'val') else self.shape
+            self._ocp_shape = solid.wrapped if hasattr(solid, 'wrapped') else solid
+            
             logger.info(f"Successfully loaded CAD file: {self.file_path.name}")
         except Exception as e:
             logger.error(f"Failed to load CAD file {self.file_path}: {str(e)}")
             raise
     
-    def extract_mass_properties(self) -> Dict[str, Any]:
+    def extract_mass_properties(self, precision: float = None) -> Dict[str, Any]:
         """
         Extract mass properties from the geometry.
         
+        Args:
+            precision: Relative error bound for adaptive integration over the
+                exact surfaces. None uses OpenCASCADE's fixed-order Gauss
+                integration, which is faster but unbounded on complex faces.
+        
         Returns:
             Dictionary with volume, surface_area, center_of_mass, bounding_box
         """
+        if precision in self._mass_props:
+            return self._mass_props[precision]
+        
         try:
-            # Get the solid from the shape
-            solid = self.shape.val() if hasattr(self.shape, 'val') else self.shape
+            ocp_shape = self._ocp_shape
             
-            # Extract the wrapped OCP shape for direct OCP API calls
-            ocp_shape = solid.wrapped if hasattr(solid, 'wrapped') else solid
-            
-            # Calculate volume
+            # Volume, area and box are left as separate whole-shape calls:
+            # each walks the faces inside OCCT, whereas fusing them would
+            # mean a Python-level loop per face, costing more than it saves
             volume_props = GProp_GProps()
-            BRepGProp.VolumeProperties_s(ocp_shape, volume_props, OnlyClosed=True)
-            volume = volume_props.Mass()
-            
-            # Calculate surface area
             surface_props = GProp_GProps()
-            BRepGProp.SurfaceProperties_s(ocp_shape, surface_props)
+            if precision is None:
+                BRepGProp.VolumeProperties_s(ocp_shape, volume_props, OnlyClosed=True)
+                BRepGProp.SurfaceProperties_s(ocp_shape, surface_props)
+            else:
+                BRepGProp.VolumeProperties_s(ocp_shape, volume_props, precision, OnlyClosed=True)
+                BRepGProp.SurfaceProperties_s(ocp_shape, surface_props, precision)
+            
+            volume = volume_props.Mass()
             surface_area = surface_props.Mass()
             
             # Get center of mass
@@ -95,29 +593,23 @@ class GeometryProcessor:
                 'z': com.Z()
             }
             
-            # Get bounding box
-            bbox = self.shape.val().BoundingBox() if hasattr(self.shape, 'val') else self.shape.BoundingBox()
-            bounding_box = {
-                'xmin': bbox.xmin,
-                'xmax': bbox.xmax,
-                'ymin': bbox.ymin,
-                'ymax': bbox.ymax,
-                'zmin': bbox.zmin,
-                'zmax': bbox.zmax,
-                'dimensions': {
-                    'length': bbox.xmax - bbox.xmin,
-                    'width': bbox.ymax - bbox.ymin,
-                    'height': bbox.zmax - bbox.zmin
-                }
-            }
+            # Get bounding box; the optimal box is tight to the exact
+            # surfaces but costs more per face than the standard one
+            bbox = Bnd_Box()
+            if self._subshape_map(TopAbs_FACE).Extent() <= OPTIMAL_BBOX_FACE_LIMIT:
+                BRepBndLib.AddOptimal_s(ocp_shape, bbox)
+            else:
+                BRepBndLib.Add_s(ocp_shape, bbox)
+            bounding_box = _bounding_box_dict(*bbox.Get())
             
-            return {
+            self._mass_props[precision] = {
                 'volume': volume,
                 'surface_area': surface_area,
                 'center_of_mass': center_of_mass,
                 'bounding_box': bounding_box,
                 'units': 'mm'  # OpenCASCADE typically uses mm
             }
+            return self._mass_props[precision]
         
         except Exception as e:
             logger.error(f"Failed to extract mass properties: {str(e)}")
@@ -131,41 +623,11 @@ class GeometryProcessor:
             Unit string ('mm', 'in', 'm', etc.) or 'mm' as default
         """
         try:
-            with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read(50000).upper()  # Read first 50KB, case-insensitive
-                
-            # STEP files contain unit info in UNCERTAINTY_MEASURE_WITH_UNIT or similar entities
-            # Common patterns (case-insensitive):
-            # #XX = ( LENGTH_UNIT() NAMED_UNIT(*) SI_UNIT(.MILLI.,.METRE.) );
-            # #XX = ( NAMED_UNIT(*) SI_UNIT($,.METRE.) LENGTH_UNIT() );
-            # #XX = UNCERTAINTY_MEASURE_WITH_UNIT(...LENGTH_MEASURE...METRE...)
-            
-            # Search patterns with priority (most specific first)
-            unit_patterns = [
-                ('MILLI', 'METRE', 'mm'),
-                ('CENTI', 'METRE', 'cm'),
-                ('MICRO', 'METRE', 'um'),
-                ('KILO', 'METRE', 'km'),
-                ('INCH', None, 'in'),
-                ('FOOT', None, 'ft'),
-                ('METRE', None, 'm'),  # Check last to avoid matching MILLIMETRE
-            ]
-            
-            for prefix, suffix, unit in unit_patterns:
-                if suffix:
-                    # Look for compound patterns like MILLI + METRE
-                    if prefix in content and suffix in content:
-                        # Make sure they appear close together (within 100 chars)
-                        prefix_pos = content.find(prefix)
-                        suffix_pos = content.find(suffix, prefix_pos)
-                        if suffix_pos - prefix_pos < 100:
-                            logger.info(f"Detected unit from STEP file: {unit} (pattern: {prefix}+{suffix})")
-                            return unit
-                else:
-                    # Single word patterns like INCH
-                    if prefix in content:
-                        logger.info(f"Detected unit from STEP file: {unit} (pattern: {prefix})")
-                        return unit
+            stat = self.file_path.stat()
+            unit = _scan_step_units(str(self.file_path), stat.st_size, stat.st_mtime_ns)
+            if unit:
+                logger.info(f"Detected unit from STEP file: {unit}")
+                return unit
             
             # Default to millimeters if not found
             logger.warning("Could not detect units from STEP file, defaulting to mm")
@@ -175,6 +637,23 @@ class GeometryProcessor:
             logger.warning(f"Failed to extract units: {str(e)}, defaulting to mm")
             return 'mm'
     
+    def _subshape_map(self, shape_type):
+        """
+        Indexed map of the shape's sub-shapes of one type, built once.
+        
+        Topology counts and BOM enumeration read the same maps, so the
+        shape is traversed once per type however many extractors run.
+        
+        Args:
+            shape_type: TopAbs shape type
+        
+        Returns:
+            TopTools_IndexedMapOfShape of the sub-shapes
+        """
+        if shape_type not in self._subshape_maps:
+            self._subshape_maps[shape_type] = _map_subshapes(self._ocp_shape, shape_type)
+        return self._subshape_maps[shape_type]
+    
     def extract_topology_info(self) -> Dict[str, int]:
         """
         Extract topology counts from the geometry.
@@ -182,48 +661,40 @@ class GeometryProcessor:
         Returns:
             Dictionary with counts of solids, shells, faces, edges, vertices
         """
+        if self._topology is not None:
+            return self._topology
+        
         try:
-            solid = self.shape.val() if hasattr(self.shape, 'val') else self.shape
-            
-            # Extract the wrapped OCP shape for direct OCP API calls
-            ocp_shape = solid.wrapped if hasattr(solid, 'wrapped') else solid
-            
-            from OCP.TopAbs import TopAbs_SOLID, TopAbs_SHELL, TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX
-            from OCP.TopExp import TopExp_Explorer
-            
-            def count_shapes(shape, shape_type):
-                """Count shapes of a specific type."""
-                explorer = TopExp_Explorer(shape, shape_type)
-                count = 0
-                while explorer.More():
-                    count += 1
-                    explorer.Next()
-                return count
-            
-            return {
-                'solids': count_shapes(ocp_shape, TopAbs_SOLID),
-                'shells': count_shapes(ocp_shape, TopAbs_SHELL),
-                'faces': count_shapes(ocp_shape, TopAbs_FACE),
-                'edges': count_shapes(ocp_shape, TopAbs_EDGE),
-                'vertices': count_shapes(ocp_shape, TopAbs_VERTEX)
+            self._topology = {
+                'solids': self._subshape_map(TopAbs_SOLID).Extent(),
+                'shells': self._subshape_map(TopAbs_SHELL).Extent(),
+                'faces': self._subshape_map(TopAbs_FACE).Extent(),
+                'edges': self._subshape_map(TopAbs_EDGE).Extent(),
+                'vertices': self._subshape_map(TopAbs_VERTEX).Extent()
             }
+            return self._topology
         
         except Exception as e:
             logger.error(f"Failed to extract topology info: {str(e)}")
             raise
     
-    def run_design_rule_checks(self) -> Dict[str, Any]:
+    def run_design_rule_checks(self, topology: Dict[str, int] = None, deep: bool = False,
+                               max_edges: int = HIGH_EDGE_COUNT_THRESHOLD) -> Dict[str, Any]:
         """
         Run design rule checks on the geometry.
         
+        Args:
+            topology: Topology counts already extracted for this shape
+            deep: When free edges are found, sew the faces to test whether the
+                gaps close within tolerance (much slower than the topological
+                free-edge check)
+            max_edges: Edge count above which a HIGH_EDGE_COUNT warning is raised
+        
         Returns:
             Dictionary with validation results and issues found
         """
         try:
-            solid = self.shape.val() if hasattr(self.shape, 'val') else self.shape
-            
-            # Extract the wrapped OCP shape for direct OCP API calls
-            ocp_shape = solid.wrapped if hasattr(solid, 'wrapped') else solid
+            ocp_shape = self._ocp_shape
             
             # Run BRep analyzer
             analyzer = BRepCheck_Analyzer(ocp_shape)
@@ -231,28 +702,29 @@ class GeometryProcessor:
             
             issues = []
             
-            # Check for manifold geometry
-            try:
-                from OCP.BRepClass3d import BRepClass3d_SolidClassifier
-                classifier = BRepClass3d_SolidClassifier(ocp_shape)
-                is_manifold = True
-            except Exception:
-                is_manifold = False
+            # Check for manifold geometry: no edge may bound more than two faces
+            free_edges, non_manifold_edges = _classify_edges(ocp_shape)
+            is_manifold = non_manifold_edges == 0
+            if not is_manifold:
                 issues.append({
                     'severity': 'error',
                     'code': 'NON_MANIFOLD',
-                    'message': 'Geometry contains non-manifold edges or vertices'
+                    'message': f"Geometry contains {non_manifold_edges} non-manifold edge(s)"
                 })
             
-            # Check for closed/watertight geometry
-            try:
-                from OCP.BRepBuilderAPI import BRepBuilderAPI_Sewing
-                sewing = BRepBuilderAPI_Sewing()
-                sewing.Add(ocp_shape)
-                sewing.Perform()
-                is_closed = sewing.SewedShape().Closed()
-            except Exception:
-                is_closed = False
+            # Check for closed/watertight geometry: no free boundary edges.
+            # Sewing can only close gaps within tolerance, so it is only
+            # worth running when the topological check finds open edges.
+            is_closed = free_edges == 0
+            if deep and not is_closed:
+                try:
+                    sewing = BRepBuilderAPI_Sewing()
+                    sewing.Add(ocp_shape)
+                    sewing.Perform()
+                    is_closed = sewing.SewedShape().Closed()
+                except Exception:
+                    is_closed = False
+            if not is_closed:
                 issues.append({
                     'severity': 'warning',
                     'code': 'NOT_WATERTIGHT',
@@ -268,8 +740,9 @@ class GeometryProcessor:
                 })
             
             # Check for small edges/faces
-            topology = self.extract_topology_info()
-            if topology['edges'] > 10000:
+            if topology is None:
+                topology = self.extract_topology_info()
+            if topology['edges'] > max_edges:
                 issues.append({
                     'severity': 'warning',
                     'code': 'HIGH_EDGE_COUNT',
@@ -296,99 +769,199 @@ class GeometryProcessor:
                 }]
             }
     
-    def extract_bom_structure(self) -> List[Dict[str, Any]]:
+    def extract_bom_structure(self, detail_level: str = 'full') -> BOMTable:
         """
         Extract assembly structure / Bill of Materials from STEP file.
         
         For STEP files with assembly structure, this extracts component information.
         Returns hierarchical BOM with part names, quantities, and properties.
         
+        Args:
+            detail_level: 'full' for mass properties, bounding boxes and topology;
+                'topology' to enumerate components with topology counts only
+        
         Returns:
-            List of assembly components with their transformations and metadata
+            BOMTable of assembly components; use to_dict_list() for dictionaries
         """
+        if detail_level in self._bom:
+            return self._bom[detail_level]
+        
         try:
-            solid = self.shape.val() if hasattr(self.shape, 'val') else self.shape
-            
-            # Extract the wrapped OCP shape for direct OCP API calls
-            ocp_shape = solid.wrapped if hasattr(solid, 'wrapped') else solid
-            
-            from OCP.TopAbs import TopAbs_SOLID
-            from OCP.TopExp import TopExp_Explorer
-            from OCP.Bnd import Bnd_Box
-            from OCP.BRepBndLib import BRepBndLib
-            
-            components = []
+            # Enumerate all solids in the assembly in one traversal
+            solids = _map_keys(self._subshape_map(TopAbs_SOLID))
             
-            # Try to parse STEP file metadata for assembly names
-            component_names = self._extract_step_component_names()
+            if len(solids) <= 1:
+                # Single-part (or solid-less) file: nothing to deduplicate or
+                # parallelize, and a lone solid reuses the shape's mass properties
+                prototype_ids = list(range(len(solids)))
+                intrinsics = [self._single_part_properties(solid, detail_level) for solid in solids]
+            else:
+                prototype_ids, intrinsics = self._measure_assembly_parts(solids, detail_level)
             
-            # Explore all solids in the assembly
-            explorer = TopExp_Explorer(ocp_shape, TopAbs_SOLID)
-            index = 0
+            rows = np.zeros(len(solids), dtype=_bom_dtype())
+            rows['index'] = np.arange(len(solids))
             
-            while explorer.More():
-                component_solid = explorer.Current()
-                
+            # Each instance writes only its own row, so threads never share state
+            def describe(index):
+                intrinsic = intrinsics[prototype_ids[index]]
+                if intrinsic is None:
+                    return False
                 try:
-                    # Calculate geometric properties
-                    volume_props = GProp_GProps()
-                    surface_props = GProp_GProps()
-                    BRepGProp.VolumeProperties_s(component_solid, volume_props)
-                    BRepGProp.SurfaceProperties_s(component_solid, surface_props)
-                    
-                    volume = volume_props.Mass()
-                    surface_area = surface_props.Mass()
-                    com = volume_props.CentreOfMass()
-                    
-                    # Get bounding box for component
-                    bbox = Bnd_Box()
-                    BRepBndLib.Add_s(component_solid, bbox)
-                    xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get()
-                    
-                    # Determine component name
-                    component_name = component_names.get(index, f"Component_{index + 1}")
-                    
-                    components.append({
-                        'index': index,
-                        'name': component_name,
-                        'part_number': f"PN-{index + 1:04d}",
-                        'quantity': 1,
-                        'node_type': 'PART',
-                        'volume': volume,
-                        'surface_area': surface_area,
-                        'mass': volume * 0.0000027,  # Rough estimate assuming aluminum (2.7 g/cm³)
-                        'center_of_mass': {
-                            'x': com.X(),
-                            'y': com.Y(),
-                            'z': com.Z()
-                        },
-                        'bounding_box': {
-                            'xmin': xmin, 'xmax': xmax,
-                            'ymin': ymin, 'ymax': ymax,
-                            'zmin': zmin, 'zmax': zmax,
-                            'dimensions': {
-                                'length': xmax - xmin,
-                                'width': ymax - ymin,
-                                'height': zmax - zmin
-                            }
-                        },
-                        'topology': self._count_component_topology(component_solid)
-                    })
-                    
+                    self._fill_component_row(rows[index], solids[index], intrinsic)
+                    return True
                 except Exception as comp_error:
                     logger.warning(f"Failed to process component {index}: {comp_error}")
-                
-                index += 1
-                explorer.Next()
+                    return False
+            
+            described = np.fromiter(_map_ordered(describe, range(len(solids))), dtype=bool, count=len(solids))
+            rows = rows[described]
+            
+            # Try to parse STEP file metadata for assembly names
+            component_names = self._extract_step_component_names() if len(rows) else {}
+            names = [component_names.get(int(index), f"Component_{index + 1}") for index in rows['index']]
+            components = BOMTable(rows, names, measured=(detail_level != 'topology'))
             
             if not components:
                 logger.info("No assembly structure found, treating as single part")
             
+            self._bom[detail_level] = components
             return components
         
         except Exception as e:
             logger.error(f"Failed to extract BOM structure: {str(e)}")
-            return []
+            return BOMTable.empty()
+    
+    def _measure_assembly_parts(self, solids: List[Any], detail_level: str) -> Tuple[List[int], List[Any]]:
+        """
+        Measure each distinct part of a multi-solid assembly once.
+        
+        Instances of one part share a TShape and differ only in location.
+        Mapping the unlocated solids groups them, so location-independent
+        properties are computed once per distinct part.
+        
+        Args:
+            solids: Located solids of the assembly
+            detail_level: 'full' or 'topology' (see extract_bom_structure)
+        
+        Returns:
+            Tuple of (prototype index per solid, _measure_part result or
+            None per prototype)
+        """
+        prototype_map = TopTools_IndexedMapOfShape()
+        prototype_ids = [prototype_map.Add(solid.Located(TopLoc_Location())) - 1 for solid in solids]
+        prototypes = _map_keys(prototype_map)
+        
+        def measure(prototype_id):
+            try:
+                return _measure_part(prototypes[prototype_id], detail_level)
+            except Exception as proto_error:
+                logger.warning(f"Failed to measure part {prototype_id}: {proto_error}")
+                return None
+        
+        return prototype_ids, _map_ordered(measure, range(len(prototypes)))
+    
+    def _single_part_properties(self, solid, detail_level: str):
+        """
+        Properties of the only solid in the file, or None if they fail.
+        
+        Args:
+            solid: The single TopoDS_Solid of the shape, with its location
+            detail_level: 'full' or 'topology' (see extract_bom_structure)
+        
+        Returns:
+            _single_solid_properties result, or topology counts only
+        """
+        try:
+            if detail_level == 'topology':
+                return {'topology': self._single_solid_topology(solid)}
+            return self._single_solid_properties(solid)
+        except Exception as part_error:
+            logger.warning(f"Failed to measure single part: {part_error}")
+            return None
+    
+    def _single_solid_properties(self, solid) -> Dict[str, Any]:
+        """
+        Properties of the only solid in the file.
+        
+        When the solid accounts for every face of the shape, its mass
+        properties are the shape's, so the cached extract_mass_properties
+        result (already in assembly coordinates) is reused instead of
+        integrating the solid a second time.
+        
+        Args:
+            solid: The single TopoDS_Solid of the shape, with its location
+        
+        Returns:
+            Dictionary in the _measure_part format, or with
+            placed center_of_mass/bounding_box dictionaries when reused
+        """
+        topology = self._single_solid_topology(solid)
+        if topology['faces'] != self.extract_topology_info()['faces']:
+            return _measure_part(solid.Located(TopLoc_Location()), 'full')
+        
+        return dict(self.extract_mass_properties(), topology=topology)
+    
+    def _single_solid_topology(self, solid) -> Dict[str, int]:
+        """
+        Topology counts of the only solid in the file.
+        
+        A single-part file usually loads as the solid itself, in which
+        case the shape's cached sub-shape maps already hold its counts
+        and the solid is not traversed again.
+        
+        Args:
+            solid: The single TopoDS_Solid of the shape, with its location
+        
+        Returns:
+            Dictionary with faces, edges and vertices counts
+        """
+        if not solid.IsSame(self._ocp_shape):
+            return _part_topology(solid)
+        
+        topology = self.extract_topology_info()
+        return {key: topology[key] for key in ('faces', 'edges', 'vertices')}
+    
+    def _fill_component_row(self, row, component_solid, intrinsic: Dict[str, Any]):
+        """
+        Write the BOM values for one solid of the assembly into its row.
+        
+        Args:
+            row: Record of the BOM array to fill (see _bom_dtype)
+            component_solid: TopoDS_Solid to describe, with its assembly location
+            intrinsic: Properties of the unlocated part from _measure_part,
+                or placed shape-level properties from _single_solid_properties
+        """
+        topology = intrinsic['topology']
+        row['faces'] = topology['faces']
+        row['edges'] = topology['edges']
+        row['vertices'] = topology['vertices']
+        if 'volume' not in intrinsic:
+            return
+        
+        row['volume'] = intrinsic['volume']
+        row['surface_area'] = intrinsic['surface_area']
+        row['mass'] = intrinsic['volume'] * 0.0000027  # Rough estimate assuming aluminum (2.7 g/cm³)
+        
+        if 'bounding_box' in intrinsic:
+            # Shape-level properties are already in assembly coordinates
+            com = intrinsic['center_of_mass']
+            bbox = intrinsic['bounding_box']
+            row['com'] = (com['x'], com['y'], com['z'])
+            row['bbox_min'] = (bbox['xmin'], bbox['ymin'], bbox['zmin'])
+            row['bbox_max'] = (bbox['xmax'], bbox['ymax'], bbox['zmax'])
+            return
+        
+        # Move the part's centre of mass into assembly coordinates
+        com = intrinsic['center_of_mass'].Transformed(component_solid.Location().Transformation())
+        
+        # Get bounding box for component (depends on its placement)
+        bbox = Bnd_Box()
+        BRepBndLib.Add_s(component_solid, bbox)
+        xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get()
+        
+        row['com'] = (com.X(), com.Y(), com.Z())
+        row['bbox_min'] = (xmin, ymin, zmin)
+        row['bbox_max'] = (xmax, ymax, zmax)
     
     def _extract_step_component_names(self) -> Dict[int, str]:
         """
@@ -397,95 +970,316 @@ class GeometryProcessor:
         Returns:
             Dictionary mapping component index to name
         """
-        names = {}
         try:
-            with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                # Look for PRODUCT definitions in STEP file
-                import re
-                product_pattern = r"#\d+\s*=\s*PRODUCT\s*\('([^']+)'"
-                matches = re.findall(product_pattern, content)
-                
-                for idx, name in enumerate(matches):
-                    if name and name not in ['', 'UNNAMED', 'UNKNOWN']:
-                        names[idx] = name
-                
-                logger.info(f"Found {len(names)} named components in STEP file")
+            stat = self.file_path.stat()
+            names = dict(_scan_step_product_names(str(self.file_path), stat.st_size, stat.st_mtime_ns))
+            logger.info(f"Found {len(names)} named components in STEP file")
+            return names
         except Exception as e:
             logger.debug(f"Could not extract STEP component names: {e}")
-        
-        return names
+            return {}
     
-    def _count_component_topology(self, solid) -> Dict[str, int]:
+    def export_to_stl(self, output_path: str, linear_deflection: float = 0.1, angular_deflection: float = 0.1):
         """
-        Count topology elements for a specific component.
+        Export geometry to STL format for web preview using native OpenCascade.
         
         Args:
-            solid: TopoDS_Solid to analyze
-        
-        Returns:
-            Dictionary with topology counts
+            output_path: Path to save STL file
+            linear_deflection: Mesh quality (smaller = finer mesh)
+            angular_deflection: Mesh quality for curved surfaces
         """
         try:
-            from OCP.TopAbs import TopAbs_FACE, TopAbs_EDGE, TopAbs_VERTEX
-            from OCP.TopExp import TopExp_Explorer
+            ocp_shape = self._ocp_shape
             
-            def count_shapes(shape, shape_type):
-                explorer = TopExp_Explorer(shape, shape_type)
-                count = 0
-                while explorer.More():
-                    count += 1
-                    explorer.Next()
-                return count
+            # Meshing attaches the triangulation to the shape, so repeated
+            # exports at the same deflection can write it directly
+            mesh_params = (linear_deflection, angular_deflection)
+            if self._mesh_params != mesh_params:
+                _init_mesh_thread_pool()
+                
+                # Arguments: shape, linear deflection, isRelative, angular deflection, isInParallel
+                mesh = BRepMesh_IncrementalMesh(ocp_shape, linear_deflection, False, angular_deflection, True)
+                mesh.Perform()
+                
+                if not mesh.IsDone():
+                    raise Exception("Mesh generation failed")
+                
+                self._mesh_params = mesh_params
+            
+            # Write to STL file
+            writer = StlAPI_Writer()
+            writer.Write(ocp_shape, output_path)
+            
+            logger.info(f"Exported STL to: {output_path}")
             
-            return {
-                'faces': count_shapes(solid, TopAbs_FACE),
-                'edges': count_shapes(solid, TopAbs_EDGE),
-                'vertices': count_shapes(solid, TopAbs_VERTEX)
-            }
         except Exception as e:
-            logger.debug(f"Failed to count topology: {e}")
-            return {'faces': 0, 'edges': 0, 'vertices': 0}
+            logger.error(f"Failed to export STL: {e}")
+            raise
     
-    def process_all(self) -> Dict[str, Any]:
+    def invalidate_mesh(self):
+        """Force the next export_to_stl call to re-tessellate the shape."""
+        self._mesh_params = None
+    
+    def process_all(self) -> 'GeometryResult':
         """
         Run all geometry extraction processes.
         
+        Extraction is deferred: each section is computed when first read
+        from the returned result, and to_dict() materializes all of them.
+        
         Returns:
-            Complete metadata dictionary
+            GeometryResult over this processor
         """
+        return GeometryResult(self)
+
+
+class GeometryResult:
+    """
+    Lazily evaluated output of GeometryProcessor.process_all.
+    
+    Each section runs its extractor on first access and keeps the value.
+    Dictionary-style access (result['topology']) is supported for callers
+    written against the old process_all dictionary.
+    """
+    
+    __slots__ = ('_proc', '_mp', '_topo', '_val', '_bom')
+    
+    def __init__(self, processor: GeometryProcessor):
+        self._proc = processor
+        self._mp = None
+        self._topo = None
+        self._val = None
+        self._bom = None
+    
+    @property
+    def file_name(self) -> str:
+        return self._proc.file_path.name
+    
+    @property
+    def file_format(self) -> str:
+        return self._proc.file_path.suffix.upper().replace('.', '')
+    
+    @property
+    def mass_properties(self) -> Dict[str, Any]:
+        if self._mp is None:
+            self._mp = self._proc.extract_mass_properties()
+        return self._mp
+    
+    @property
+    def topology(self) -> Dict[str, Any]:
+        if self._topo is None:
+            self._topo = self._proc.extract_topology_info()
+        return self._topo
+    
+    @property
+    def validation(self) -> Dict[str, Any]:
+        if self._val is None:
+            self._val = self._proc.run_design_rule_checks(self.topology)
+        return self._val
+    
+    @property
+    def bom_components(self) -> List[Dict[str, Any]]:
+        if self._bom is None:
+            self._bom = self._proc.extract_bom_structure().to_dict_list()
+        return self._bom
+    
+    @property
+    def processing_status(self) -> str:
+        return 'success'
+    
+    _KEYS = ('file_name', 'file_format', 'mass_properties', 'topology',
+             'validation', 'bom_components', 'processing_status')
+    
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default=None):
         try:
-            mass_props = self.extract_mass_properties()
-            topology = self.extract_topology_info()
-            validation = self.run_design_rule_checks()
-            bom = self.extract_bom_structure()
-            
-            return {
-                'file_name': self.file_path.name,
-                'file_format': self.file_path.suffix.upper().replace('.', ''),
-                'mass_properties': mass_props,
-                'topology': topology,
-                'validation': validation,
-                'bom_components': bom,
-                'processing_status': 'success'
-            }
+            return self[key]
+        except KeyError:
+            return default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Run every extractor and return the complete metadata dictionary.
+        
+        Returns:
+            Metadata dictionary, or a 'failed' status dictionary if
+            extraction raised
+        """
+        try:
+            return {key: getattr(self, key) for key in self._KEYS}
         
         except Exception as e:
             logger.error(f"Failed to process geometry: {str(e)}")
             return {
-                'file_name': self.file_path.name,
+                'file_name': self.file_name,
                 'processing_status': 'failed',
                 'error': str(e)
             }
 
 
+def summarize_bom_components(components: 'BOMTable') -> Dict[str, Any]:
+    """
+    Aggregate assembly-level properties from extract_bom_structure output.
+    
+    Totals, overall bounds and the volume-weighted centroid are computed
+    as vectorized reductions over the BOM columns. Tables without mass
+    properties (the 'topology' detail level) only report zero totals.
+    
+    Args:
+        components: BOMTable from extract_bom_structure
+    
+    Returns:
+        Dictionary with total_volume, total_mass and, when the components
+        have mass properties, center_of_mass and bounding_box
+    """
+    if not components.measured or not len(components):
+        return {'total_volume': 0.0, 'total_mass': 0.0}
+    
+    rows = components.rows
+    volumes = rows['volume']
+    total_volume = float(volumes.sum())
+    xmin, ymin, zmin = rows['bbox_min'].min(axis=0)
+    xmax, ymax, zmax = rows['bbox_max'].max(axis=0)
+    if total_volume > 0:
+        cx, cy, cz = np.average(rows['com'], axis=0, weights=volumes)
+    else:
+        cx, cy, cz = rows['com'].mean(axis=0)
+    
+    return {
+        'total_volume': total_volume,
+        'total_mass': float(rows['mass'].sum()),
+        'center_of_mass': {'x': float(cx), 'y': float(cy), 'z': float(cz)},
+        'bounding_box': _bounding_box_dict(xmin, ymin, zmin, xmax, ymax, zmax),
+    }
+
+
+def cad_cache_key(file_path: str) -> str:
+    """
+    Content-addressed key for a CAD file's processing results.
+    
+    Hashes the file contents in CAD_CACHE_HASH_CHUNK reads with 128-bit
+    BLAKE2b. The file size and CAD_CACHE_SCHEMA_VERSION are part of the
+    key, so re-uploads of the same file hit while format changes miss.
+    
+    Args:
+        file_path: Path to the CAD file
+    
+    Returns:
+        Hex digest key
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    size = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CAD_CACHE_HASH_CHUNK), b''):
+            hasher.update(chunk)
+            size += len(chunk)
+    return f"v{CAD_CACHE_SCHEMA_VERSION}-{size}-{hasher.hexdigest()}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _stat_cad_cache_key(path: str, size: int, mtime_ns: int) -> str:
+    """
+    cad_cache_key memoized on (path, size, mtime_ns), so an unchanged
+    file is not hashed again.
+    """
+    return cad_cache_key(path)
+
+
+def _read_cad_memory_cache(key: str):
+    """
+    Copy of in-memory processing results, or None on a miss.
+    
+    Args:
+        key: Key from cad_cache_key
+    """
+    with _cad_memory_cache_lock:
+        metadata = _cad_memory_cache.get(key)
+        if metadata is None:
+            return None
+        _cad_memory_cache.move_to_end(key)
+    return copy.deepcopy(metadata)
+
+
+def _write_cad_memory_cache(key: str, metadata: Dict[str, Any]):
+    """
+    Keep processing results in memory, evicting the least recently used.
+    
+    Args:
+        key: Key from cad_cache_key
+        metadata: Successful process_all output
+    """
+    with _cad_memory_cache_lock:
+        _cad_memory_cache[key] = copy.deepcopy(metadata)
+        _cad_memory_cache.move_to_end(key)
+        while len(_cad_memory_cache) > CAD_MEMORY_CACHE_SIZE:
+            _cad_memory_cache.popitem(last=False)
+
+
+def _cad_cache_path(key: str):
+    """Return the cache file path for a key, or None when the cache is disabled."""
+    cache_dir = getattr(settings, 'CAD_CACHE_DIR', None)
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / f"{key}.json"
+
+
+def _read_cad_cache(key: str):
+    """
+    Load cached processing results.
+    
+    Args:
+        key: Key from cad_cache_key
+    
+    Returns:
+        Metadata dictionary, or None on a miss
+    """
+    path = _cad_cache_path(key)
+    if path is None:
+        return None
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable CAD cache file {path}: {e}")
+        return None
+
+
+def _write_cad_cache(key: str, metadata: Dict[str, Any]):
+    """
+    Store processing results, replacing the file atomically.
+    
+    Args:
+        key: Key from cad_cache_key
+        metadata: Successful process_all output
+    """
+    path = _cad_cache_path(key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(metadata, option=ORJSON_OPTIONS))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError) as e:
+        logger.warning(f"Failed to write CAD cache file {path}: {e}")
+
+
 def process_cad_file(file_path: str) -> Dict[str, Any]:
     """
     Convenience function to process a CAD file and return all metadata.
     
-    This function is NOT cached because it's called from Celery tasks
-    with different file paths. Caching happens at the ViewSet level.
+    When settings.CAD_CACHE_DIR is set, results are kept in an on-disk
+    cache there, keyed by file contents (see cad_cache_key), so processing
+    the same file again skips the CAD import entirely. That directory is
+    never pruned here; eviction is left to the deployment. The most recent results
+    are also held in memory (CAD_MEMORY_CACHE_SIZE), which skips the
+    disk read and decode, and an unchanged path is not rehashed.
+    Failed runs are not cached. Callers get their own copy.
     
     Args:
         file_path: Path to STEP or IGES file
@@ -493,11 +1287,27 @@ def process_cad_file(file_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary with all extracted metadata
     """
+    stat = os.stat(file_path)
+    key = _stat_cad_cache_key(str(file_path), stat.st_size, stat.st_mtime_ns)
+    metadata = _read_cad_memory_cache(key)
+    if metadata is not None:
+        return metadata
+    
+    metadata = _read_cad_cache(key)
+    if metadata is not None:
+        logger.info(f"CAD cache hit for {Path(file_path).name}")
+        _write_cad_memory_cache(key, metadata)
+        return metadata
+    
     processor = GeometryProcessor(file_path)
-    return processor.process_all()
+    metadata = processor.process_all().to_dict()
+    if metadata.get('processing_status') == 'success':
+        _write_cad_cache(key, metadata)
+        _write_cad_memory_cache(key, metadata)
+    return metadata
 
 
-@cache_result(timeout=3600, cache_alias='longterm', key_prefix='geometry_metadata')
+@cache_result(timeout=3600, cache_alias='longterm', key_prefix='geometry_metadata', json_encode=True)
 def get_cached_geometry_metadata(design_asset_id: str) -> Dict[str, Any]:
     """
     Get geometry metadata with longterm caching (1 hour).
@@ -536,19 +1346,18 @@ def get_cached_geometry_metadata(design_asset_id: str) -> Dict[str, Any]:
             except (AttributeError, NotImplementedError):
                 # For S3, download to temp file
                 import tempfile
+                from designs.s3_service import download_to_file
                 with tempfile.NamedTemporaryFile(delete=False, suffix=design.filename) as tmp_file:
-                    with design.file.open('rb') as f:
-                        tmp_file.write(f.read())
+                    download_to_file(design.file, tmp_file)
                     file_path = tmp_file.name
                     temp_file_path = tmp_file.name
             
-            processor = GeometryProcessor(file_path)
-            metadata = processor.process_all()
+            # Round-trip through orjson to turn numpy values into plain JSON types
+            metadata = orjson.loads(orjson.dumps(process_cad_file(file_path), option=ORJSON_OPTIONS))
             
             # Clean up temp file if it was created
             if temp_file_path:
                 try:
-                    import os
                     os.unlink(temp_file_path)
                 except Exception:
                     pass
@@ -570,36 +1379,3 @@ def get_cached_geometry_metadata(design_asset_id: str) -> Dict[str, Any]:
             'status': 'error',
             'message': str(e)
         }
-
-    def export_to_stl(self, output_path: str, linear_deflection: float = 0.1, angular_deflection: float = 0.1):
-        """
-        Export geometry to STL format for web preview using native OpenCascade.
-        
-        Args:
-            output_path: Path to save STL file
-            linear_deflection: Mesh quality (smaller = finer mesh)
-            angular_deflection: Mesh quality for curved surfaces
-        """
-        try:
-            from OCP.StlAPI import StlAPI_Writer
-            from OCP.BRepMesh import BRepMesh_IncrementalMesh
-            
-            # Get the shape
-            solid = self.shape.val() if hasattr(self.shape, 'val') else self.shape
-            
-            # Generate mesh with specified deflection
-            mesh = BRepMesh_IncrementalMesh(solid, linear_deflection, False, angular_deflection, True)
-            mesh.Perform()
-            
-            if not mesh.IsDone():
-                raise Exception("Mesh generation failed")
-            
-            # Write to STL file
-            writer = StlAPI_Writer()
-            writer.Write(solid, output_path)
-            
-            logger.info(f"Exported STL to: {output_path}")
-            
-        except Exception as e:
-            logger.error(f"Failed to export STL: {e}")
-            raise
@@ -0,0 +1,26 @@
+"""
+Custom ORM lookups for Enginel.
+
+Registered when the designs app is ready (see apps.py):
+- net_contained_by: PostgreSQL inet containment (ip <<= network)
+"""
+from django.db.models import GenericIPAddressField, Lookup
+
+
+@GenericIPAddressField.register_lookup
+class NetContainedBy(Lookup):
+    """
+    Match addresses inside a network given in CIDR notation.
+    
+    Usage: AuditLog.objects.filter(ip_address__net_contained_by='10.0.0.0/8')
+    
+    Compiles to the native inet <<= operator, which a GiST index using
+    inet_ops can serve.
+    """
+    lookup_name = 'net_contained_by'
+    prepare_rhs = False
+    
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} <<= {rhs}::inet', lhs_params + rhs_params
@@ -3,109 +3,210 @@ Django middleware for error tracking and performance monitoring.
 
 Automatically tracks all requests, errors, and performance metrics.
 """
+import functools
+import re
 import time
 import logging
 from django.utils.deprecation import MiddlewareMixin
-from .monitoring import ErrorTracker, log_api_request, MetricsCollector
+from .monitoring import ErrorTracker, log_api_request, MetricsCollector, PerformanceMonitor
 
 logger = logging.getLogger(__name__)
 
+# First path segment after /api/, e.g. 'designs' for /api/designs/<id>/
+_ENDPOINT_RE = re.compile(r'^/api/([^/]+)')
 
-class ErrorTrackingMiddleware(MiddlewareMixin):
+# Numeric and UUID path segments, replaced so per-object URLs share one stats key
+_PATH_ID_RE = re.compile(
+    r'/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)'
+)
+
+
+def is_api_request(request):
     """
-    Middleware to track all exceptions and log them with context.
+    Whether the request targets the REST API.
+    
+    The prefix check runs once per request; the result is stored on the
+    request for every later middleware.
+    """
+    is_api = getattr(request, '_is_api', None)
+    if is_api is None:
+        is_api = request._is_api = request.path.startswith('/api/')
+    return is_api
+
+
+def _track_exception(request, exception):
+    """Log a view exception with request context."""
+    context = {
+        'method': request.method,
+        'path': request.path,
+        'query_params': dict(request.GET),
+    }
+    
+    # Don't log request body for security (may contain passwords, tokens)
+    # In production, you might want to log it for POST/PUT with PII redaction
+    
+    user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+    
+    ErrorTracker.log_error(
+        error=exception,
+        context=context,
+        user_id=user_id,
+        request_path=request.path,
+        severity='ERROR'
+    )
+
+
+def _elapsed_seconds(request):
+    """Seconds since process_request stamped the request, or None."""
+    start_ns = getattr(request, '_t0', None)
+    if start_ns is None:
+        return None
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_path(path):
+    """
+    Replace object IDs in a path with ':id'.
+    
+    Args:
+        path: Request path, e.g. /api/designs/<uuid>/download/
+    
+    Returns:
+        Route-shaped path, e.g. /api/designs/:id/download/
+    """
+    return _PATH_ID_RE.sub('/:id', path)
+
+
+def _record_performance(request, response, duration):
+    """Store per-route duration statistics."""
+    PerformanceMonitor._record_duration(
+        f"api_{request.method}_{_normalize_path(request.path)}",
+        duration,
+        error=response.status_code >= 400
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_endpoint(path):
+    """
+    Return the API endpoint name for a request path.
+    
+    Args:
+        path: Request path
+    
+    Returns:
+        First segment after /api/, or 'unknown'
+    """
+    match = _ENDPOINT_RE.match(path)
+    return match.group(1) if match else 'unknown'
+
+
+def _record_metrics(request, response):
+    """Count API requests by total, status code and endpoint."""
+    MetricsCollector.increment_batch((
+        'http_requests_total',
+        f'http_status_{response.status_code}',
+        f'endpoint_{_extract_endpoint(request.path)}',
+    ))
+
+
+class UnifiedRequestMiddleware(MiddlewareMixin):
+    """
+    Error tracking, request logging, performance monitoring and metrics
+    in a single middleware.
+    
+    The clock is sampled once when the request arrives and once when the
+    response leaves, and the API path check runs once, instead of each
+    concern doing its own pass over every request.
     """
     
+    def process_request(self, request):
+        """Mark request start time."""
+        request._t0 = time.perf_counter_ns()
+    
     def process_exception(self, request, exception):
         """Called when a view raises an exception."""
-        context = {
-            'method': request.method,
-            'path': request.path,
-            'query_params': dict(request.GET),
-        }
-        
-        # Don't log request body for security (may contain passwords, tokens)
-        # In production, you might want to log it for POST/PUT with PII redaction
+        _track_exception(request, exception)
         
-        user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+        # Don't suppress the exception - let Django's error handling continue
+        return None
+    
+    def process_response(self, request, response):
+        """Log, time and count API requests."""
+        # Only track API requests (not static files, admin, etc.)
+        if not is_api_request(request):
+            return response
         
-        ErrorTracker.log_error(
-            error=exception,
-            context=context,
-            user_id=user_id,
-            request_path=request.path,
-            severity='ERROR'
-        )
+        duration = _elapsed_seconds(request)
+        if duration is not None:
+            log_api_request(request, response, duration)
+            _record_performance(request, response, duration)
+        _record_metrics(request, response)
         
-        # Don't suppress the exception - let Django's error handling continue
+        return response
+
+
+class ErrorTrackingMiddleware(MiddlewareMixin):
+    """
+    Middleware to track all exceptions and log them with context.
+    
+    Kept for existing configurations; UnifiedRequestMiddleware includes it.
+    """
+    
+    def process_exception(self, request, exception):
+        """Called when a view raises an exception."""
+        _track_exception(request, exception)
         return None
 
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """
     Middleware to log all API requests with performance metrics.
+    
+    Kept for existing configurations; UnifiedRequestMiddleware includes it.
     """
     
     def process_request(self, request):
         """Mark request start time."""
-        request._start_time = time.time()
+        request._t0 = time.perf_counter_ns()
     
     def process_response(self, request, response):
         """Log request after response is ready."""
-        if hasattr(request, '_start_time'):
-            duration = time.time() - request._start_time
-            
-            # Only log API requests (not static files, admin, etc.)
-            if request.path.startswith('/api/'):
-                log_api_request(request, response, duration)
-        
+        duration = _elapsed_seconds(request)
+        if duration is not None and is_api_request(request):
+            log_api_request(request, response, duration)
         return response
 
 
 class PerformanceMonitoringMiddleware(MiddlewareMixin):
     """
     Middleware to track request performance and detect slow endpoints.
+    
+    Kept for existing configurations; UnifiedRequestMiddleware includes it.
     """
     
     def process_request(self, request):
         """Mark request start time."""
-        request._perf_start = time.time()
+        request._t0 = time.perf_counter_ns()
     
     def process_response(self, request, response):
         """Track performance metrics."""
-        if hasattr(request, '_perf_start'):
-            duration = time.time() - request._perf_start
-            
-            # Track API endpoint performance
-            if request.path.startswith('/api/'):
-                endpoint = request.path
-                method = request.method
-                
-                # Store performance data
-                from .monitoring import PerformanceMonitor
-                PerformanceMonitor._record_duration(
-                    f"api_{method}_{endpoint}",
-                    duration,
-                    error=response.status_code >= 400
-                )
-        
+        duration = _elapsed_seconds(request)
+        if duration is not None and is_api_request(request):
+            _record_performance(request, response, duration)
         return response
 
 
 class MetricsMiddleware(MiddlewareMixin):
     """
     Middleware to collect application metrics.
+    
+    Kept for existing configurations; UnifiedRequestMiddleware includes it.
     """
     
     def process_response(self, request, response):
         """Collect metrics from requests."""
-        # Track API requests by status code
-        if request.path.startswith('/api/'):
-            MetricsCollector.increment_counter('http_requests_total')
-            MetricsCollector.increment_counter(f'http_status_{response.status_code}')
-            
-            # Track by endpoint
-            endpoint = request.path.split('/')[2] if len(request.path.split('/')) > 2 else 'unknown'
-            MetricsCollector.increment_counter(f'endpoint_{endpoint}')
-        
+        if is_api_request(request):
+            _record_metrics(request, response)
         return response
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:48
+
+import django.db.models.expressions
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0015_add_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='duration_seconds',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.datetime.Extract(django.db.models.expressions.CombinedExpression(models.F('completed_at'), '-', models.F('created_at')), 'epoch'), help_text='Seconds from creation to completion (null until completed)', output_field=models.FloatField()),
+        ),
+        migrations.AddIndex(
+            model_name='analysisjob',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['duration_seconds'], name='aj_duration_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:49
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0016_analysisjob_duration_seconds'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GistIndex(django.contrib.postgres.indexes.OpClass('ip_address', name='inet_ops'), name='audit_ip_gist'),
+        ),
+    ]
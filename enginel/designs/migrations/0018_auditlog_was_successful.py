@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0017_auditlog_ip_gist_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='was_successful',
+            field=models.BooleanField(default=True, help_text='False if the audited action failed'),
+        ),
+        # Backfill: entries whose recorded changes mention an error were failures
+        migrations.RunSQL(
+            sql=[(
+                "UPDATE audit_logs SET was_successful = FALSE WHERE changes::text ILIKE %s",
+                ['%error%'],
+            )],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(condition=models.Q(('was_successful', False)), fields=['-timestamp'], name='audit_failures_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0018_auditlog_was_successful'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='security_clearance_rank',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=models.Case(models.When(security_clearance_level='UNCLASSIFIED', then=models.Value(0)), models.When(security_clearance_level='CONFIDENTIAL', then=models.Value(1)), models.When(security_clearance_level='SECRET', then=models.Value(2)), models.When(security_clearance_level='TOP_SECRET', then=models.Value(3)), default=models.Value(0)), help_text='Clearance level as an ordered rank (0 = UNCLASSIFIED)', output_field=models.SmallIntegerField()),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:50
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0019_customuser_security_clearance_rank'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analysisjob',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='aj_created_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='audit_timestamp_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='designasset',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='da_created_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='designseries',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='ds_created_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='markup',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='markup_created_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='reviewsession',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='rs_created_brin', pages_per_range=32),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0020_add_created_at_brin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='designasset',
+            name='has_geometry_flag',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=models.Q(('metadata__volume_mm3__isnull', False), ('metadata__surface_area_mm2__isnull', False), _connector='OR'), help_text='Whether geometry extraction stored volume or surface area', output_field=models.BooleanField()),
+        ),
+        migrations.AddIndex(
+            model_name='designasset',
+            index=models.Index(condition=models.Q(('has_geometry_flag', True)), fields=['-created_at'], name='da_with_geometry_idx'),
+        ),
+    ]
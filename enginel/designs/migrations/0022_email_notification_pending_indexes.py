@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0021_designasset_has_geometry_flag'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(condition=models.Q(('next_retry_at__isnull', True), ('status', 'PENDING')), fields=['-priority', 'queued_at'], name='notif_pending_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(condition=models.Q(('next_retry_at__isnull', False), ('status', 'PENDING')), fields=['next_retry_at'], name='notif_pending_retry_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:06
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0022_email_notification_pending_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='analysisjob',
+            name='analysis_jo_celery__d60842_idx',
+        ),
+        migrations.AlterField(
+            model_name='analysisjob',
+            name='celery_task_id',
+            field=models.CharField(blank=True, help_text='Celery task UUID for tracking', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='analysisjob',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['celery_task_id'], name='aj_celery_task_id_hash'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['resource_id'], name='audit_resource_id_hash'),
+        ),
+    ]
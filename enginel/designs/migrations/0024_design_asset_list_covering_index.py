@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0023_hash_indexes_for_exact_lookups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='designasset',
+            index=models.Index(fields=['-created_at'], include=('id', 'series', 'version_number', 'filename', 'revision', 'classification', 'status', 'is_valid_geometry', 'uploaded_by'), name='da_list_covering'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:35
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0024_design_asset_list_covering_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='designasset',
+            name='design_asse_file_ha_856264_idx',
+        ),
+        migrations.AlterField(
+            model_name='designasset',
+            name='file_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 hash for integrity verification', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='designasset',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['file_hash'], name='da_file_hash_hash'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0025_file_hash_hash_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='designasset',
+            name='status',
+            field=models.CharField(choices=[('UPLOADING', 'Upload in Progress'), ('PROCESSING', 'Processing Geometry'), ('COMPLETED', 'Processing Complete'), ('FAILED', 'Processing Failed')], default='UPLOADING', help_text='Current processing status', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='designasset',
+            index=models.Index(condition=models.Q(('status__in', ['UPLOADING', 'PROCESSING', 'FAILED'])), fields=['status'], name='da_active_status'),
+        ),
+    ]
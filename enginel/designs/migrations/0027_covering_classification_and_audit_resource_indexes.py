@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0026_design_asset_partial_status_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_logs_resourc_bda8a6_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='designasset',
+            name='design_asse_classif_ab361b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['resource_type', 'resource_id', '-timestamp'], include=('action', 'actor_username'), name='audit_resource_cov'),
+        ),
+        migrations.AddIndex(
+            model_name='designasset',
+            index=models.Index(fields=['classification', 'status', '-created_at'], include=('filename', 'series', 'uploaded_by'), name='da_cls_st_cov'),
+        ),
+    ]
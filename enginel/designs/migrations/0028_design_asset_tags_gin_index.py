@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0027_covering_classification_and_audit_resource_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='designasset',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='da_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
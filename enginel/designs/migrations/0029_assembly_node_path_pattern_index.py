@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0028_design_asset_tags_gin_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assemblynode',
+            index=models.Index(django.contrib.postgres.indexes.OpClass('path', name='varchar_pattern_ops'), name='bom_path_pattern'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_latest_version(apps, schema_editor):
+    """Point every existing series at its highest-numbered version."""
+    DesignSeries = apps.get_model('designs', 'DesignSeries')
+    DesignAsset = apps.get_model('designs', 'DesignAsset')
+    
+    newest = DesignAsset.objects.filter(
+        series=models.OuterRef('pk')
+    ).order_by('-version_number').values('pk')[:1]
+    DesignSeries.objects.update(latest_version=models.Subquery(newest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0029_assembly_node_path_pattern_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='designseries',
+            name='latest_version',
+            field=models.OneToOneField(blank=True, editable=False, help_text='Most recent version (maintained automatically)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='designs.designasset'),
+        ),
+        migrations.RunPython(populate_latest_version, migrations.RunPython.noop),
+    ]
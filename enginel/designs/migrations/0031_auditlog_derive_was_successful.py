@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0030_design_series_latest_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='was_successful',
+            field=models.BooleanField(default=None, help_text='False if the audited action failed'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('designs', '0031_auditlog_derive_was_successful'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='was_successful',
+            field=models.BooleanField(db_default=True, default=True, help_text='False if the audited action failed'),
+        ),
+    ]
@@ -4,12 +4,69 @@ Mixins for adding caching to DRF ViewSets.
 Provides automatic caching of list and retrieve responses with
 proper cache key generation and invalidation.
 """
-from rest_framework.response import Response
-from designs.cache import CacheManager, CacheKey
+import hashlib
+from functools import cached_property, lru_cache
+from urllib.parse import urlencode
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpResponse
+from rest_framework import serializers
+from designs.cache import (
+    CacheManager, CacheKey, LocalCache, bump_model_generation, bump_model_generations,
+    get_model_generation
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-process copy of recently cached responses; their keys carry the
+# model or instance generation, so invalidation never has to reach it
+_local_responses = LocalCache(maxsize=2048, ttl=5)
+
+
+@lru_cache(maxsize=None)
+def serializer_columns(serializer_class, model, annotations=frozenset()):
+    """
+    Model columns a serializer reads, as .only() arguments.
+    
+    Each readable field's source is resolved against the model, following
+    forward relations ('series.name' becomes 'series__name'). Sources
+    naming queryset annotations are skipped.
+    
+    Args:
+        serializer_class: Serializer used for the rows
+        model: Model class of the queryset
+        annotations: Names annotated onto the queryset
+    
+    Returns:
+        Tuple of field paths, or None if any field's columns cannot be
+        known (method fields, nested serializers, properties, reverse or
+        many-to-many relations), in which case all columns must be loaded
+    """
+    columns = []
+    for field in serializer_class().fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+        
+        parts = field.source.split('.')
+        if parts[0] in annotations:
+            continue
+        
+        related_model = model
+        for part in parts:
+            if related_model is None:
+                return None
+            try:
+                model_field = related_model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            if model_field.many_to_many or model_field.one_to_many:
+                return None
+            related_model = model_field.related_model
+        columns.append('__'.join(parts))
+    return tuple(columns)
+
 
 class CachedViewSetMixin:
     """
@@ -17,6 +74,12 @@ class CachedViewSetMixin:
     
     Override cache_timeout to customize TTL.
     Override get_cache_key_prefix to customize cache key namespace.
+    List queries load only the columns the list serializer reads (see
+    serializer_columns). Set retrieve_only_fields to load only those
+    columns on a retrieve cache miss (passed to .only()), and
+    retrieve_select_related_fields for relations only the detail
+    serializer follows. List relations belong on the FilterSet (see
+    EnginelFilterSet).
     
     Example:
         class DesignAssetViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
@@ -29,6 +92,49 @@ class CachedViewSetMixin:
     cache_alias = 'default'
     cache_list = True  # Cache list responses
     cache_retrieve = True  # Cache retrieve responses
+    cache_per_user = True  # False shares entries across users (see get_cache_user_key)
+    retrieve_only_fields = ()  # Columns loaded for retrieve; empty loads all
+    retrieve_select_related_fields = ()  # Extra joins for retrieve
+    
+    @cached_property
+    def cache_manager(self):
+        """CacheManager for cache_alias, built once per view instance (request)."""
+        return CacheManager(self.cache_alias)
+    
+    def get_queryset(self):
+        """Restrict list and retrieve queries to the columns they serialize."""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            columns = serializer_columns(
+                self.get_serializer_class(),
+                queryset.model,
+                frozenset(queryset.query.annotations)
+            )
+            return queryset.only(*columns) if columns else queryset
+        if self.action != 'retrieve':
+            return queryset
+        if self.retrieve_only_fields:
+            queryset = queryset.only(*self.retrieve_only_fields)
+        if self.retrieve_select_related_fields:
+            queryset = queryset.select_related(*self.retrieve_select_related_fields)
+        return queryset
+    
+    def get_cache_user_key(self):
+        """
+        User part of cache keys.
+        
+        Per-user unless cache_per_user is False, in which case every user
+        shares one entry for JSON responses. Cached responses are returned
+        before get_object() runs, so only opt out where results do not depend
+        on the user and there are no object-level permissions. Other formats
+        stay per-user: the browsable API page embeds the requester's CSRF
+        token and username.
+        """
+        if not self.cache_per_user and self.request.accepted_renderer.format == 'json':
+            return 'shared'
+        # DRF authenticated the request in initial(), so this is a plain
+        # attribute read; AnonymousUser has no pk
+        return self.request.user.pk or 'anon'
     
     def get_cache_key_prefix(self):
         """Get cache key prefix based on model name."""
@@ -38,87 +144,153 @@ class CachedViewSetMixin:
         """
         Generate cache key for list endpoint.
         
-        Includes query parameters to ensure different queries get different caches.
+        Includes query parameters to ensure different queries get different caches,
+        and the model's write generation so any save or delete retires the entry.
         """
         prefix = self.get_cache_key_prefix()
         
-        # Build key from query params
-        query_params = self.request.query_params.dict()
+        # Digest the canonical query string (sorted keys, every value of
+        # repeated params sorted) for a fixed-size key suffix; _nocache only
+        # changes how the cache is read, so a refreshed response replaces
+        # the entry other requests use
+        query_string = urlencode(
+            sorted(
+                (key, sorted(values))
+                for key, values in self.request.query_params.lists()
+                if key != '_nocache'
+            ),
+            doseq=True
+        )
+        query_digest = hashlib.blake2b(query_string.encode(), digest_size=16).hexdigest()
         
         # Add user context for permission-based filtering
-        user_id = self.request.user.id if self.request.user.is_authenticated else 'anon'
+        user_id = self.get_cache_user_key()
         
-        return CacheManager.make_key(
-            'list',
-            user_id,
-            prefix=prefix,
-            **query_params
-        )
+        generation = get_model_generation(prefix)
+        renderer_format = self.request.accepted_renderer.format
+        return f"{prefix}:list:{user_id}:{generation}:{renderer_format}:{query_digest}"
     
     def get_retrieve_cache_key(self, pk):
-        """Generate cache key for retrieve endpoint."""
+        """
+        Generate cache key for retrieve endpoint.
+        
+        Includes the instance's write generation, so a save or delete
+        retires the cached entry for every user at once.
+        """
         prefix = self.get_cache_key_prefix()
-        user_id = self.request.user.id if self.request.user.is_authenticated else 'anon'
+        user_id = self.get_cache_user_key()
         
         return CacheManager.make_key(
             'detail',
             pk,
             user_id,
+            get_model_generation(prefix, pk),
+            self.request.accepted_renderer.format,
             prefix=prefix
         )
     
     def list(self, request, *args, **kwargs):
         """Override list to add caching."""
-        if not self.cache_list:
+        # Only JSON bodies are cached; browsable API pages carry a CSRF token
+        if not self.cache_list or request.accepted_renderer.format != 'json':
             return super().list(request, *args, **kwargs)
         
-        cache_key = self.get_list_cache_key()
-        cache_manager = CacheManager(self.cache_alias)
+        # Build the key once per request; it costs a generation read
+        cache_key = getattr(request, '_list_cache_key', None)
+        if cache_key is None:
+            cache_key = request._list_cache_key = self.get_list_cache_key()
         
-        # Try to get from cache
-        cached_response = cache_manager.get(cache_key)
+        # Try to get from cache, unless the client forces a refresh
+        cached_response = None if self.cache_bypassed(request) else self.get_cached_response(cache_key)
         if cached_response is not None:
             logger.debug(f"Cache hit for list: {cache_key}")
-            return Response(cached_response)
+            return cached_response
         
         # Get fresh data
         response = super().list(request, *args, **kwargs)
         
         # Cache successful responses
         if response.status_code == 200:
-            cache_manager.set(cache_key, response.data, self.cache_timeout)
+            self.cache_response(cache_key, response)
             logger.debug(f"Cached list response: {cache_key}")
         
         return response
     
     def retrieve(self, request, *args, **kwargs):
         """Override retrieve to add caching."""
-        if not self.cache_retrieve:
+        # Only JSON bodies are cached; browsable API pages carry a CSRF token
+        if not self.cache_retrieve or request.accepted_renderer.format != 'json':
             return super().retrieve(request, *args, **kwargs)
         
         # Get primary key from kwargs (handle different lookup fields)
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
         pk = kwargs.get(lookup_url_kwarg)
         
-        cache_key = self.get_retrieve_cache_key(pk)
-        cache_manager = CacheManager(self.cache_alias)
+        cache_key = getattr(request, '_retrieve_cache_key', None)
+        if cache_key is None:
+            cache_key = request._retrieve_cache_key = self.get_retrieve_cache_key(pk)
         
-        # Try to get from cache
-        cached_response = cache_manager.get(cache_key)
+        # Try to get from cache, unless the client forces a refresh
+        cached_response = None if self.cache_bypassed(request) else self.get_cached_response(cache_key)
         if cached_response is not None:
             logger.debug(f"Cache hit for retrieve: {cache_key}")
-            return Response(cached_response)
+            return cached_response
         
         # Get fresh data
         response = super().retrieve(request, *args, **kwargs)
         
         # Cache successful responses
         if response.status_code == 200:
-            cache_manager.set(cache_key, response.data, self.cache_timeout)
+            self.cache_response(cache_key, response)
             logger.debug(f"Cached retrieve response: {cache_key}")
         
         return response
     
+    def cache_bypassed(self, request):
+        """
+        Whether the client asked for a fresh response.
+        
+        Set by ?_nocache=1 or a Cache-Control: no-cache header. The cache
+        is not read, but the fresh response still replaces the entry.
+        """
+        if request.query_params.get('_nocache'):
+            return True
+        return 'no-cache' in request.headers.get('Cache-Control', '')
+    
+    def cache_response(self, cache_key, response):
+        """
+        Render a response and cache its body and content type.
+        
+        The response is rendered here with the negotiated renderer, as
+        finalize_response would, so a later hit is served as bytes without
+        serializing or rendering again. Only JSONRenderer output is cached.
+        """
+        if self.request.accepted_renderer.format != 'json':
+            return
+        response.accepted_renderer = self.request.accepted_renderer
+        response.accepted_media_type = self.request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        response.render()
+        cached = (response.content, response['Content-Type'])
+        self.cache_manager.set(cache_key, cached, self.cache_timeout)
+        _local_responses.set(f"{self.cache_alias}:{cache_key}", cached)
+    
+    def get_cached_response(self, cache_key):
+        """
+        Return the cached rendered response for a key, or None on a miss.
+        
+        Checks the in-process copy before the shared cache.
+        """
+        local_key = f"{self.cache_alias}:{cache_key}"
+        cached = _local_responses.get(local_key)
+        if cached is None:
+            cached = self.cache_manager.get(cache_key)
+            if cached is None:
+                return None
+            _local_responses.set(local_key, cached)
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+    
     def perform_create(self, serializer):
         """Override create to invalidate list cache."""
         result = super().perform_create(serializer)
@@ -133,8 +305,7 @@ class CachedViewSetMixin:
         result = super().perform_update(serializer)
         
         # Invalidate both detail and list caches
-        self.invalidate_detail_cache(pk)
-        self.invalidate_list_cache()
+        self.invalidate_caches(pk)
         
         return result
     
@@ -145,29 +316,30 @@ class CachedViewSetMixin:
         result = super().perform_destroy(instance)
         
         # Invalidate both detail and list caches
-        self.invalidate_detail_cache(pk)
-        self.invalidate_list_cache()
+        self.invalidate_caches(pk)
         
         return result
     
     def invalidate_list_cache(self):
         """Invalidate all list caches for this resource."""
         prefix = self.get_cache_key_prefix()
-        pattern = f"{prefix}:*:list:*"
+        bump_model_generation(prefix)
         
-        cache_manager = CacheManager(self.cache_alias)
-        deleted = cache_manager.delete_pattern(pattern)
+        logger.debug(f"Invalidated list cache entries for {prefix}")
+    
+    def invalidate_caches(self, pk):
+        """Invalidate detail caches for an instance and all list caches in one round trip."""
+        prefix = self.get_cache_key_prefix()
+        bump_model_generations((prefix, pk), (prefix, None))
         
-        if deleted > 0:
-            logger.debug(f"Invalidated {deleted} list cache entries for {prefix}")
+        logger.debug(f"Invalidated detail and list cache entries for {prefix} {pk}")
     
     def invalidate_detail_cache(self, pk):
-        """Invalidate detail cache for specific instance."""
-        cache_key = self.get_retrieve_cache_key(pk)
-        cache_manager = CacheManager(self.cache_alias)
-        cache_manager.delete(cache_key)
+        """Invalidate detail caches for specific instance, for all users."""
+        prefix = self.get_cache_key_prefix()
+        bump_model_generation(prefix, pk)
         
-        logger.debug(f"Invalidated detail cache: {cache_key}")
+        logger.debug(f"Invalidated detail cache entries for {prefix} {pk}")
 
 
 class LongtermCachedMixin(CachedViewSetMixin):
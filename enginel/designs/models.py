@@ -15,10 +15,34 @@ Models:
 """
 import uuid
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, GistIndex, HashIndex, OpClass
+from django.db import connection, models
+from django.db.models.functions import Extract, Upper
 from django.core.validators import MinValueValidator, RegexValidator
 from django.utils import timezone
 from treebeard.mp_tree import MP_Node
+from designs.cache import CacheManager, get_model_generation
+
+
+# Security clearance levels ordered from lowest to highest
+CLEARANCE_RANK = {
+    'UNCLASSIFIED': 0,
+    'CONFIDENTIAL': 1,
+    'SECRET': 2,
+    'TOP_SECRET': 3,
+}
+
+# Access rules for export-control classifications, which do not depend on
+# clearance rank; other classifications are compared by clearance rank
+_CLASSIFICATION_CHECKS = {
+    'UNCLASSIFIED': lambda user: True,
+    'EAR99': lambda user: True,
+    'CUI': lambda user: True,
+    'ITAR': lambda user: user.is_us_person,
+}
+
+# Seconds a computed BOM subtree mass stays in the longterm cache
+BOM_CACHE_TIMEOUT = 3600
 
 
 class CustomUser(AbstractUser):
@@ -67,6 +91,21 @@ class CustomUser(AbstractUser):
         help_text="User's security clearance level"
     )
     
+    # Integer form of the clearance level, maintained by the database
+    security_clearance_rank = models.GeneratedField(
+        expression=models.Case(
+            *[
+                models.When(security_clearance_level=level, then=models.Value(rank))
+                for level, rank in CLEARANCE_RANK.items()
+            ],
+            default=models.Value(0),
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+        db_index=True,
+        help_text="Clearance level as an ordered rank (0 = UNCLASSIFIED)"
+    )
+    
     organization = models.CharField(
         max_length=255,
         blank=True,
@@ -84,6 +123,13 @@ class CustomUser(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['username']
+        indexes = [
+            # Trigram indexes serve icontains (UPPER(col) LIKE UPPER(%s)) filters
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_username_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='users_email_trgm'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='users_first_name_trgm'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='users_last_name_trgm'),
+        ]
     
     def __str__(self):
         org = self.organization or 'No Org'
@@ -99,24 +145,14 @@ class CustomUser(AbstractUser):
         Returns:
             Boolean indicating access permission
         """
-        if classification == 'UNCLASSIFIED':
-            return True
-        
-        if classification == 'ITAR':
-            return self.is_us_person
+        check = _CLASSIFICATION_CHECKS.get(classification)
+        if check is not None:
+            return check(self)
         
-        # For clearance-based classifications
-        clearance_hierarchy = {
-            'UNCLASSIFIED': 0,
-            'CONFIDENTIAL': 1,
-            'SECRET': 2,
-            'TOP_SECRET': 3,
-        }
-        
-        user_level = clearance_hierarchy.get(self.security_clearance_level, 0)
-        required_level = clearance_hierarchy.get(classification, 0)
-        
-        return user_level >= required_level
+        # For clearance-based classifications. Ranks are read from the
+        # module constant rather than security_clearance_rank, which is only
+        # populated once the row has been loaded from the database.
+        return CLEARANCE_RANK.get(self.security_clearance_level, 0) >= CLEARANCE_RANK.get(classification, 0)
 
 
 class APIKey(models.Model):
@@ -236,6 +272,38 @@ class RefreshToken(models.Model):
         super().save(*args, **kwargs)
 
 
+class DesignSeriesQuerySet(models.QuerySet):
+    """QuerySet helpers for listing series without per-row version queries."""
+    
+    def with_version_stats(self):
+        """
+        Annotate version statistics on each series.
+        
+        Adds ``version_count`` and ``latest_version_number``, so
+        get_version_count() costs no query per row. Callers that render the
+        latest asset itself add select_related('latest_version').
+        
+        Returns:
+            QuerySet: Annotated series queryset
+        """
+        return self.annotate(
+            version_count=models.Count('versions'),
+            latest_version_number=models.Max('versions__version_number'),
+        )
+    
+    def refresh_latest_versions(self):
+        """
+        Re-point latest_version at each series' highest-numbered version.
+        
+        Returns:
+            int: Number of series rows updated
+        """
+        newest = DesignAsset.objects.filter(
+            series=models.OuterRef('pk')
+        ).order_by('-version_number').values('pk')[:1]
+        return self.update(latest_version=models.Subquery(newest))
+
+
 class DesignSeries(models.Model):
     """
     Represents an abstract product/part (e.g., "Turbine Blade").
@@ -272,10 +340,23 @@ class DesignSeries(models.Model):
         related_name='design_series_created'
     )
     
+    # Highest-numbered version, kept current by designs.signals
+    latest_version = models.OneToOneField(
+        'DesignAsset',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Most recent version (maintained automatically)"
+    )
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = DesignSeriesQuerySet.as_manager()
+    
     class Meta:
         db_table = 'design_series'
         verbose_name = 'Design Series'
@@ -284,17 +365,45 @@ class DesignSeries(models.Model):
         unique_together = [['part_number']]
         indexes = [
             models.Index(fields=['part_number']),
+            # Trigram indexes serve icontains (UPPER(col) LIKE UPPER(%s)) filters
+            GinIndex(OpClass(Upper('part_number'), name='gin_trgm_ops'), name='ds_part_number_trgm'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='ds_name_trgm'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='ds_description_trgm'),
+            # created_at follows insert order
+            BrinIndex(fields=['created_at'], name='ds_created_brin', pages_per_range=32),
         ]
     
     def __str__(self):
         return f"{self.part_number} - {self.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Pointer as loaded, so save() can tell whether the caller moved it
+        instance._loaded_latest_version_id = instance.__dict__.get('latest_version_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # latest_version is moved by conditional UPDATEs in designs.signals.
+        # Unless the caller changed it, treat it as deferred so a full save
+        # of an older instance does not write back a stale pointer
+        if (not self._state.adding and kwargs.get('update_fields') is None
+                and 'latest_version_id' in self.__dict__
+                and self.latest_version_id == getattr(self, '_loaded_latest_version_id', None)):
+            del self.__dict__['latest_version_id']
+            self._state.fields_cache.pop('latest_version', None)
+        super().save(*args, **kwargs)
+    
     def get_latest_version(self):
         """Returns the most recent DesignAsset for this series."""
+        if self.latest_version_id is not None:
+            return self.latest_version
         return self.versions.order_by('-version_number').first()
     
     def get_version_count(self):
         """Returns total number of versions."""
+        if hasattr(self, 'version_count'):
+            return self.version_count
         return self.versions.count()
 
 
@@ -403,7 +512,6 @@ class DesignAsset(models.Model):
     )
     file_hash = models.CharField(
         max_length=64,
-        db_index=True,
         blank=True,
         default='',
         help_text="SHA-256 hash for integrity verification"
@@ -439,7 +547,6 @@ class DesignAsset(models.Model):
         max_length=20,
         choices=STATUS_CHOICES,
         default='UPLOADING',
-        db_index=True,
         help_text="Current processing status"
     )
     processing_error = models.TextField(
@@ -453,6 +560,16 @@ class DesignAsset(models.Model):
         blank=True,
         help_text="Extracted physical properties: volume, surface_area, center_of_mass, etc."
     )
+    has_geometry_flag = models.GeneratedField(
+        expression=(
+            models.Q(metadata__volume_mm3__isnull=False)
+            | models.Q(metadata__surface_area_mm2__isnull=False)
+        ),
+        output_field=models.BooleanField(),
+        db_persist=True,
+        db_index=True,
+        help_text="Whether geometry extraction stored volume or surface area"
+    )
     
     # Validation Results
     is_valid_geometry = models.BooleanField(
@@ -496,10 +613,46 @@ class DesignAsset(models.Model):
         ]
         
         indexes = [
-            models.Index(fields=['classification', 'status']),
+            # Classification/status listings, newest first; INCLUDE serves the
+            # row summary without heap lookups
+            models.Index(
+                fields=['classification', 'status', '-created_at'],
+                name='da_cls_st_cov',
+                include=['filename', 'series', 'uploaded_by'],
+            ),
             models.Index(fields=['uploaded_by', 'created_at']),
-            models.Index(fields=['file_hash']),
+            # Only ever matched by equality
+            HashIndex(fields=['file_hash'], name='da_file_hash_hash'),
             models.Index(fields=['series', '-version_number']),
+            # Trigram index serves icontains (UPPER(col) LIKE UPPER(%s)) filters
+            GinIndex(OpClass(Upper('filename'), name='gin_trgm_ops'), name='da_filename_trgm'),
+            # Tag containment (tags @> '[...]'); jsonb_path_ops only supports
+            # @> but is far smaller than the default jsonb_ops
+            GinIndex(fields=['tags'], name='da_tags_gin', opclasses=['jsonb_path_ops']),
+            # created_at follows insert order
+            BrinIndex(fields=['created_at'], name='da_created_brin', pages_per_range=32),
+            models.Index(
+                fields=['-created_at'],
+                name='da_with_geometry_idx',
+                condition=models.Q(has_geometry_flag=True),
+            ),
+            # Most rows are COMPLETED, which an index cannot narrow; only the
+            # in-flight and failed rows that workers and admins look up are indexed
+            models.Index(
+                fields=['status'],
+                name='da_active_status',
+                condition=models.Q(status__in=['UPLOADING', 'PROCESSING', 'FAILED']),
+            ),
+            # Default list ordering; INCLUDE carries the columns
+            # DesignAssetListSerializer reads, for index-only scans
+            models.Index(
+                fields=['-created_at'],
+                name='da_list_covering',
+                include=[
+                    'id', 'series', 'version_number', 'filename', 'revision',
+                    'classification', 'status', 'is_valid_geometry', 'uploaded_by',
+                ],
+            ),
         ]
     
     def __str__(self):
@@ -515,13 +668,30 @@ class DesignAsset(models.Model):
         Returns:
             Boolean indicating access permission
         """
-        if not user.has_clearance_for(self.classification):
-            return False
+        # has_clearance_for already applies the ITAR US-person rule
+        return user.has_clearance_for(self.classification)
+    
+    @classmethod
+    def filter_accessible(cls, queryset, user, lookup=''):
+        """
+        Restrict a queryset to rows whose design the user may access.
         
-        if self.classification == 'ITAR' and not user.is_us_person:
-            return False
+        The SQL counterpart of can_be_accessed_by: design classifications
+        are export-control levels, of which only ITAR can be denied (to
+        non-US persons), so one WHERE clause replaces per-row checks.
         
-        return True
+        Args:
+            queryset: Queryset of DesignAsset or of a model related to it
+            user: CustomUser instance
+            lookup: Relation path from the queryset's model to DesignAsset,
+                e.g. 'design_asset__'
+        
+        Returns:
+            Filtered queryset
+        """
+        if user.is_us_person:
+            return queryset
+        return queryset.exclude(**{f'{lookup}classification': 'ITAR'})
 
 
 class AssemblyNode(MP_Node):
@@ -604,24 +774,80 @@ class AssemblyNode(MP_Node):
         db_table = 'assembly_nodes'
         verbose_name = 'BOM Node'
         verbose_name_plural = 'BOM Nodes'
+        indexes = [
+            # Trigram indexes serve icontains (UPPER(col) LIKE UPPER(%s)) filters
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='bom_name_trgm'),
+            GinIndex(OpClass(Upper('part_number'), name='gin_trgm_ops'), name='bom_part_number_trgm'),
+            # Treebeard subtree reads filter path LIKE 'prefix%'; the unique
+            # index on path uses the database collation and cannot serve them
+            models.Index(OpClass('path', name='varchar_pattern_ops'), name='bom_path_pattern'),
+        ]
     
     def __str__(self):
         indent = "  " * (self.depth - 1) if self.depth > 0 else ""
         return f"{indent}{self.name} (x{self.quantity})"
     
+    def get_ancestor_paths(self):
+        """Materialized paths of this node and each of its ancestors."""
+        return [self.path[:end] for end in range(self.steplen, len(self.path) + 1, self.steplen)]
+    
     def get_total_mass(self):
-        """Calculate total mass including all children."""
+        """
+        Calculate total mass including all children.
+        
+        Cached in the longterm cache under the node's BOM generation. Saving
+        or deleting a node bumps the generation of every path in its
+        get_ancestor_paths(), so any change in the subtree retires it.
+        """
+        key = CacheManager.make_key(
+            'total_mass',
+            self.path,
+            get_model_generation('assemblynode', self.path),
+            prefix='bom'
+        )
+        return CacheManager('longterm').get_or_set(key, self._compute_total_mass, BOM_CACHE_TIMEOUT)
+    
+    def _compute_total_mass(self):
+        """
+        Sum the subtree mass in the database.
+        
+        Each descendant's mass counts once per instance, i.e. multiplied by
+        the quantities along its path below this node. A recursive CTE walks
+        the subtree level by level, joining each node to its parent by the
+        parent's path (its own path minus one step), and sums in one query.
+        """
         total = self.mass or 0
-        for child in self.get_children():
-            total += (child.get_total_mass() * child.quantity)
-        return total
+        if self.is_leaf():
+            return total
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH RECURSIVE subtree AS MATERIALIZED (
+                    SELECT path, depth, mass, quantity
+                    FROM {self._meta.db_table}
+                    WHERE path LIKE %(prefix)s AND depth > %(depth)s
+                ), walk AS (
+                    SELECT path, depth, mass, quantity::double precision AS multiplier
+                    FROM subtree
+                    WHERE depth = %(depth)s + 1
+                    UNION ALL
+                    SELECT child.path, child.depth, child.mass, walk.multiplier * child.quantity
+                    FROM subtree child
+                    JOIN walk ON left(child.path, -%(steplen)s) = walk.path
+                )
+                SELECT COALESCE(SUM(COALESCE(mass, 0) * multiplier), 0) FROM walk
+                """,
+                {'prefix': f"{self.path}%", 'depth': self.depth, 'steplen': self.steplen},
+            )
+            return total + cursor.fetchone()[0]
     
     def get_part_count(self):
-        """Count total number of unique parts."""
+        """Count total number of unique parts in one COUNT over the subtree."""
         count = 1 if self.node_type == 'PART' else 0
-        for child in self.get_children():
-            count += child.get_part_count()
-        return count
+        if self.is_leaf():
+            return count
+        return count + self.get_descendants().filter(node_type='PART').count()
 
 
 class AnalysisJob(models.Model):
@@ -666,7 +892,6 @@ class AnalysisJob(models.Model):
     celery_task_id = models.CharField(
         max_length=255,
         blank=True,
-        db_index=True,
         help_text="Celery task UUID for tracking"
     )
     
@@ -685,6 +910,14 @@ class AnalysisJob(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    # Maintained by the database so duration filters can use an index
+    duration_seconds = models.GeneratedField(
+        expression=Extract(models.F('completed_at') - models.F('created_at'), 'epoch'),
+        output_field=models.FloatField(),
+        db_persist=True,
+        help_text="Seconds from creation to completion (null until completed)"
+    )
+    
     class Meta:
         db_table = 'analysis_jobs'
         verbose_name = 'Analysis Job'
@@ -692,8 +925,16 @@ class AnalysisJob(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status', 'job_type']),
-            models.Index(fields=['celery_task_id']),
+            # Only ever looked up by equality
+            HashIndex(fields=['celery_task_id'], name='aj_celery_task_id_hash'),
             models.Index(fields=['design_asset', '-created_at']),
+            models.Index(
+                fields=['duration_seconds'],
+                name='aj_duration_idx',
+                condition=models.Q(completed_at__isnull=False)
+            ),
+            # created_at follows insert order
+            BrinIndex(fields=['created_at'], name='aj_created_brin', pages_per_range=32),
         ]
     
     def __str__(self):
@@ -762,6 +1003,10 @@ class ReviewSession(models.Model):
         verbose_name = 'Review Session'
         verbose_name_plural = 'Review Sessions'
         ordering = ['-created_at']
+        indexes = [
+            # created_at follows insert order
+            BrinIndex(fields=['created_at'], name='rs_created_brin', pages_per_range=32),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.status})"
@@ -814,6 +1059,10 @@ class Markup(models.Model):
         verbose_name = 'Markup'
         verbose_name_plural = 'Markups'
         ordering = ['-created_at']
+        indexes = [
+            # created_at follows insert order
+            BrinIndex(fields=['created_at'], name='markup_created_brin', pages_per_range=32),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.author.username if self.author else 'Unknown'}"
@@ -858,6 +1107,12 @@ class AuditLog(models.Model):
         help_text="Before/after values for updates"
     )
     
+    was_successful = models.BooleanField(
+        default=True,
+        db_default=True,
+        help_text="False if the audited action failed"
+    )
+    
     timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
     
     class Meta:
@@ -867,12 +1122,37 @@ class AuditLog(models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['actor_id', 'timestamp']),
-            models.Index(fields=['resource_type', 'resource_id']),
+            # Per-resource history, newest first, readable from the index alone
+            models.Index(
+                fields=['resource_type', 'resource_id', '-timestamp'],
+                name='audit_resource_cov',
+                include=['action', 'actor_username'],
+            ),
+            HashIndex(fields=['resource_id'], name='audit_resource_id_hash'),
             models.Index(fields=['action', 'timestamp']),
+            # Trigram indexes serve icontains (UPPER(col) LIKE UPPER(%s)) filters
+            GinIndex(OpClass(Upper('actor_username'), name='gin_trgm_ops'), name='audit_actor_username_trgm'),
+            GinIndex(OpClass(Upper('resource_type'), name='gin_trgm_ops'), name='audit_resource_type_trgm'),
+            # Serves CIDR containment (ip_address__net_contained_by)
+            GistIndex(OpClass('ip_address', name='inet_ops'), name='audit_ip_gist'),
+            # Recent failures; successful rows are the bulk of the table
+            models.Index(
+                fields=['-timestamp'],
+                name='audit_failures_idx',
+                condition=models.Q(was_successful=False)
+            ),
+            # Append-only table: BRIN serves timestamp range filters, while the
+            # timestamp B-tree is kept for ORDER BY -timestamp LIMIT N lookups
+            BrinIndex(fields=['timestamp'], name='audit_timestamp_brin', pages_per_range=32),
         ]
     
     def __str__(self):
         return f"{self.action} on {self.resource_type} by {self.actor_username}"
+    
+    def save(self, *args, **kwargs):
+        # Keep actions canonical so filters can match with plain equality
+        self.action = self.action.upper()
+        super().save(*args, **kwargs)
 
 
 class Notification(models.Model):
@@ -1357,6 +1637,16 @@ class EmailNotification(models.Model):
             models.Index(fields=['status', 'priority', 'queued_at']),
             models.Index(fields=['notification_type', 'queued_at']),
             models.Index(fields=['next_retry_at']),
+            models.Index(
+                fields=['-priority', 'queued_at'],
+                name='notif_pending_new_idx',
+                condition=models.Q(status='PENDING', next_retry_at__isnull=True),
+            ),
+            models.Index(
+                fields=['next_retry_at'],
+                name='notif_pending_retry_idx',
+                condition=models.Q(status='PENDING', next_retry_at__isnull=False),
+            ),
         ]
     
     def __str__(self):
@@ -8,8 +8,9 @@ import logging
 import time
 import traceback
 from functools import wraps
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
 import json
@@ -202,6 +203,22 @@ class MetricsCollector:
         current = cache.get(cache_key, 0)
         cache.set(cache_key, current + value, timeout=86400)
     
+    @staticmethod
+    def increment_batch(metric_names: Iterable[str], value: int = 1):
+        """
+        Increment several counter metrics with one cache read and one write.
+        
+        Args:
+            metric_names: Counter names to increment
+            value: Amount added to each counter
+        """
+        cache_keys = [f'enginel:metric:{metric_name}' for metric_name in metric_names]
+        current = cache.get_many(cache_keys)
+        cache.set_many(
+            {cache_key: current.get(cache_key, 0) + value for cache_key in cache_keys},
+            timeout=86400
+        )
+    
     @staticmethod
     def record_gauge(metric_name: str, value: float):
         """Record a gauge value (current state)."""
@@ -211,8 +228,7 @@ class MetricsCollector:
     @staticmethod
     def track_file_upload(file_size_bytes: int, file_type: str):
         """Track file upload metrics."""
-        MetricsCollector.increment_counter('uploads_total')
-        MetricsCollector.increment_counter(f'uploads_{file_type}')
+        MetricsCollector.increment_batch(('uploads_total', f'uploads_{file_type}'))
         
         # Track total bytes uploaded
         cache_key = 'enginel:metric:total_bytes_uploaded'
@@ -222,8 +238,7 @@ class MetricsCollector:
     @staticmethod
     def track_celery_task(task_name: str, duration: float, status: str):
         """Track Celery task execution."""
-        MetricsCollector.increment_counter(f'celery_task_{task_name}')
-        MetricsCollector.increment_counter(f'celery_task_{task_name}_{status}')
+        MetricsCollector.increment_batch((f'celery_task_{task_name}', f'celery_task_{task_name}_{status}'))
         
         # Track duration
         cache_key = f'enginel:task_duration:{task_name}'
@@ -254,7 +269,6 @@ class HealthChecker:
     def check_database() -> Dict[str, Any]:
         """Check database connectivity."""
         try:
-            from django.db import connection
             with connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
             return {'status': 'healthy', 'message': 'Database connection OK'}
@@ -6,6 +6,8 @@ role-based access control, and ownership-based permissions.
 """
 from rest_framework import permissions
 
+from .models import CLEARANCE_RANK
+
 
 class IsOrganizationMember(permissions.BasePermission):
     """
@@ -184,19 +186,10 @@ class HasClearanceLevel(permissions.BasePermission):
         else:
             return True  # No classification requirement
         
-        # Clearance hierarchy
-        clearance_levels = {
-            'UNCLASSIFIED': 0,
-            'CONFIDENTIAL': 1,
-            'SECRET': 2,
-            'TOP_SECRET': 3,
-        }
-        
         # If classified, check clearance level
-        if classification in clearance_levels:
-            user_level = clearance_levels.get(user.security_clearance_level, 0)
-            required_level = clearance_levels[classification]
-            return user_level >= required_level
+        required_level = CLEARANCE_RANK.get(classification)
+        if required_level is not None:
+            return CLEARANCE_RANK.get(user.security_clearance_level, 0) >= required_level
         
         return True
 
@@ -8,12 +8,14 @@ This module provides utilities for:
 """
 
 import os
+import shutil
 import uuid
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, BotoCoreError
 from botocore.config import Config
 from django.conf import settings
@@ -21,6 +23,15 @@ from django.core.exceptions import ImproperlyConfigured
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streaming copies of non-S3 storage files
+COPY_CHUNK_SIZE = 1 << 20
+
+# Large S3 objects are fetched as parallel ranged GETs
+DOWNLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
 
 class S3ServiceError(Exception):
     """Base exception for S3 service errors."""
@@ -421,3 +432,23 @@ def get_s3_service() -> S3Service:
         _s3_service_instance = S3Service()
     
     return _s3_service_instance
+
+
+def download_to_file(field_file, destination) -> None:
+    """
+    Copy a stored file into an open binary file without buffering it in memory.
+    
+    S3-backed files are downloaded with boto3's managed transfer, which
+    splits large objects into parallel ranged requests. Other storages
+    are streamed in COPY_CHUNK_SIZE chunks.
+    
+    Args:
+        field_file: FieldFile to copy (e.g. DesignAsset.file)
+        destination: File object opened for binary writing
+    """
+    with field_file.open('rb'):
+        s3_object = getattr(field_file.file, 'obj', None)
+        if s3_object is not None:
+            s3_object.download_fileobj(destination, Config=DOWNLOAD_TRANSFER_CONFIG)
+        else:
+            shutil.copyfileobj(field_file.file, destination, length=COPY_CHUNK_SIZE)
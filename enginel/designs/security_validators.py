@@ -60,6 +60,37 @@ slug_validator = RegexValidator(
 )
 
 
+# Dangerous input patterns, each set compiled once into a single alternation.
+# SQL keywords that shouldn't appear in normal input
+_SQL_INJECTION_RE = re.compile('|'.join([
+    r'\bUNION\b.*\bSELECT\b',
+    r'\bDROP\b.*\bTABLE\b',
+    r'\bINSERT\b.*\bINTO\b',
+    r'\bDELETE\b.*\bFROM\b',
+    r'\bUPDATE\b.*\bSET\b',
+    r"'.*OR.*'.*=.*'",
+    r'--',
+    r'\/\*',
+    r'\*\/',
+]), re.IGNORECASE)
+
+_XSS_RE = re.compile('|'.join([
+    r'<script[^>]*>',
+    r'javascript:',
+    r'on\w+\s*=',
+    r'<iframe[^>]*>',
+    r'<object[^>]*>',
+    r'<embed[^>]*>',
+]), re.IGNORECASE)
+
+_PATH_TRAVERSAL_RE = re.compile('|'.join([
+    r'\.\.',
+    r'%2e%2e',
+    r'\.\./',
+    r'\.\.\\',
+]), re.IGNORECASE)
+
+
 def validate_no_sql_injection(value):
     """
     Validate that input doesn't contain SQL injection patterns.
@@ -73,26 +104,11 @@ def validate_no_sql_injection(value):
     if not isinstance(value, str):
         return
     
-    # SQL keywords that shouldn't appear in normal input
-    dangerous_patterns = [
-        r'\bUNION\b.*\bSELECT\b',
-        r'\bDROP\b.*\bTABLE\b',
-        r'\bINSERT\b.*\bINTO\b',
-        r'\bDELETE\b.*\bFROM\b',
-        r'\bUPDATE\b.*\bSET\b',
-        r"'.*OR.*'.*=.*'",
-        r'--',
-        r'\/\*',
-        r'\*\/',
-    ]
-    
-    value_upper = value.upper()
-    for pattern in dangerous_patterns:
-        if re.search(pattern, value_upper, re.IGNORECASE):
-            raise ValidationError(
-                _('Input contains invalid characters or patterns.'),
-                code='sql_injection'
-            )
+    if _SQL_INJECTION_RE.search(value.upper()):
+        raise ValidationError(
+            _('Input contains invalid characters or patterns.'),
+            code='sql_injection'
+        )
 
 
 def validate_no_xss(value):
@@ -108,21 +124,11 @@ def validate_no_xss(value):
     if not isinstance(value, str):
         return
     
-    dangerous_patterns = [
-        r'<script[^>]*>',
-        r'javascript:',
-        r'on\w+\s*=',
-        r'<iframe[^>]*>',
-        r'<object[^>]*>',
-        r'<embed[^>]*>',
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, value, re.IGNORECASE):
-            raise ValidationError(
-                _('Input contains potentially dangerous content.'),
-                code='xss_attempt'
-            )
+    if _XSS_RE.search(value):
+        raise ValidationError(
+            _('Input contains potentially dangerous content.'),
+            code='xss_attempt'
+        )
 
 
 def validate_no_path_traversal(value):
@@ -138,19 +144,11 @@ def validate_no_path_traversal(value):
     if not isinstance(value, str):
         return
     
-    dangerous_patterns = [
-        r'\.\.',
-        r'%2e%2e',
-        r'\.\./',
-        r'\.\.\\',
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, value, re.IGNORECASE):
-            raise ValidationError(
-                _('Input contains invalid path characters.'),
-                code='path_traversal'
-            )
+    if _PATH_TRAVERSAL_RE.search(value):
+        raise ValidationError(
+            _('Input contains invalid path characters.'),
+            code='path_traversal'
+        )
 
 
 def validate_filename(value):
@@ -407,10 +407,24 @@ class AssemblyNodeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'depth', 'numchild']
     
     def get_children(self, obj):
-        """Recursively serialize child nodes."""
-        if obj.get_children():
+        """
+        Recursively serialize child nodes.
+        
+        A 'bom_children' context entry mapping parent path to loaded
+        children (see DesignAssetViewSet.bom) is used instead of querying
+        each node; leaves are recognized from numchild without a query.
+        """
+        children_by_parent = self.context.get('bom_children')
+        if children_by_parent is not None:
+            children = children_by_parent.get(obj.path, [])
+        elif obj.numchild:
+            children = obj.get_children()
+        else:
+            children = []
+        
+        if children:
             return AssemblyNodeSerializer(
-                obj.get_children(),
+                children,
                 many=True,
                 context=self.context
             ).data
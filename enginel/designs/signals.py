@@ -5,13 +5,16 @@ Listens for model save/delete events and:
 - Invalidates related caches
 - Triggers email notifications for important events
 """
+from django.db.models import Q
 from django.db.models.signals import post_save, post_delete, m2m_changed, pre_save
 from django.dispatch import receiver
 from designs.models import (
     CustomUser, DesignSeries, DesignAsset,
-    AssemblyNode, AnalysisJob, ReviewSession, Markup, AuditLog
+    AssemblyNode, AnalysisJob, ReviewSession, Markup
+)
+from designs.cache import (
+    invalidate_model_cache, bump_model_generations, CacheManager, CacheKey
 )
-from designs.cache import invalidate_model_cache, CacheManager, CacheKey
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +23,7 @@ logger = logging.getLogger(__name__)
 @receiver([post_save, post_delete], sender=CustomUser)
 def invalidate_user_cache(sender, instance, **kwargs):
     """Invalidate user caches on save/delete."""
-    invalidate_model_cache(instance, instance.id)
+    bump_model_generations(('customuser', instance.id), ('customuser', None))
     
     logger.debug(f"Invalidated cache for user {instance.id}")
 
@@ -28,7 +31,7 @@ def invalidate_user_cache(sender, instance, **kwargs):
 @receiver([post_save, post_delete], sender=DesignSeries)
 def invalidate_series_cache(sender, instance, **kwargs):
     """Invalidate design series caches on save/delete."""
-    invalidate_model_cache(instance, instance.id)
+    bump_model_generations(('designseries', instance.id), ('designseries', None))
     
     # Invalidate series versions list
     cache_manager = CacheManager('default')
@@ -40,7 +43,11 @@ def invalidate_series_cache(sender, instance, **kwargs):
 @receiver([post_save, post_delete], sender=DesignAsset)
 def invalidate_design_cache(sender, instance, **kwargs):
     """Invalidate design asset caches on save/delete."""
-    invalidate_model_cache(instance, instance.id)
+    # Series lists report version counts; markup lists are filtered by the
+    # design's classification
+    bump_model_generations(
+        ('designasset', instance.id), ('designasset', None), ('designseries', None), ('markup', None)
+    )
     
     cache_manager = CacheManager('default')
     longterm_manager = CacheManager('longterm')
@@ -58,9 +65,35 @@ def invalidate_design_cache(sender, instance, **kwargs):
     logger.debug(f"Invalidated cache for design asset {instance.id}")
 
 
+@receiver(post_save, sender=DesignAsset)
+def advance_latest_version(sender, instance, created, update_fields=None, **kwargs):
+    """Point the series at this asset when it is its newest version."""
+    # Processing saves an asset several times; only a new asset or a
+    # renumbering can move the pointer
+    if not created and (update_fields is None or 'version_number' not in update_fields):
+        return
+    # Conditional UPDATE, so concurrent uploads cannot move the pointer back
+    DesignSeries.objects.filter(pk=instance.series_id).filter(
+        Q(latest_version__isnull=True)
+        | Q(latest_version__version_number__lt=instance.version_number)
+    ).update(latest_version=instance)
+
+
+@receiver(post_delete, sender=DesignAsset)
+def restore_latest_version(sender, instance, **kwargs):
+    """Fall back to the newest remaining version when the latest is deleted."""
+    # on_delete=SET_NULL has already cleared the pointer if it referenced instance
+    DesignSeries.objects.filter(
+        pk=instance.series_id, latest_version__isnull=True
+    ).refresh_latest_versions()
+
+
 @receiver([post_save, post_delete], sender=AssemblyNode)
 def invalidate_bom_cache(sender, instance, **kwargs):
     """Invalidate BOM caches when assembly nodes change."""
+    # Retire cached subtree totals of the node and all its ancestors
+    bump_model_generations(*(('assemblynode', path) for path in instance.get_ancestor_paths()))
+    
     if instance.design_asset:
         cache_manager = CacheManager('default')
         longterm_manager = CacheManager('longterm')
@@ -92,6 +125,9 @@ def invalidate_review_cache(sender, instance, **kwargs):
     """Invalidate review session caches."""
     invalidate_model_cache(instance, instance.id)
     
+    # Markup lists are filtered by the session's design classification
+    bump_model_generations(('markup', None))
+    
     cache_manager = CacheManager('default')
     
     # Invalidate review detail and markups
@@ -108,7 +144,7 @@ def invalidate_review_cache(sender, instance, **kwargs):
 @receiver([post_save, post_delete], sender=Markup)
 def invalidate_markup_cache(sender, instance, **kwargs):
     """Invalidate markup caches."""
-    invalidate_model_cache(instance, instance.id)
+    bump_model_generations(('markup', instance.id), ('markup', None))
     
     # Invalidate review markups list
     if instance.review_session:
@@ -119,18 +155,6 @@ def invalidate_markup_cache(sender, instance, **kwargs):
     logger.debug(f"Invalidated cache for markup {instance.id}")
 
 
-@receiver([post_save, post_delete], sender=AuditLog)
-def invalidate_audit_cache(sender, instance, **kwargs):
-    """Invalidate audit log caches."""
-    # Audit logs are write-heavy, read-light
-    # Only invalidate specific queries if needed
-    cache_manager = CacheManager('default')
-    
-    # Invalidate user's audit log cache
-    if instance.user:
-        cache_manager.delete_pattern(f"audit:user={instance.user_id}:*")
-
-
 @receiver(m2m_changed, sender=ReviewSession.reviewers.through)
 def invalidate_review_participants_cache(sender, instance, action, **kwargs):
     """Invalidate review cache when reviewers change."""
@@ -17,9 +17,8 @@ import time
 from celery import shared_task
 from django.core.files.storage import default_storage
 from django.utils import timezone
-from django.db import models
 from .models import DesignAsset, AnalysisJob, AssemblyNode
-from .geometry_processor import GeometryProcessor, GEOMETRY_AVAILABLE
+from .geometry_processor import GeometryProcessor, GEOMETRY_AVAILABLE, summarize_bom_components
 from .unit_converter import (
     convert_length, convert_area, convert_volume,
     detect_unit_from_filename, get_scale_factor, BASE_UNIT
@@ -112,14 +111,6 @@ def process_design_asset(self, design_asset_id):
             except Exception as preview_error:
                 logger.warning(f"Preview generation failed (non-critical): {preview_error}")
         
-        # Clean up temp file after all processing
-        if temp_file_path:
-            try:
-                os.unlink(temp_file_path)
-                logger.info(f"Cleaned up temp file: {temp_file_path}")
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup temp file {temp_file_path}: {cleanup_error}")
-        
         # Step 3: Run design rule checks (run inline)
         TaskProgressTracker.update_progress(task_id, 3, 5, 'Running design rule checks...')
         validation_job = AnalysisJob.objects.create(
@@ -129,7 +120,7 @@ def process_design_asset(self, design_asset_id):
             started_at=timezone.now()
         )
         
-        validation_result = run_design_rule_checks(design_asset_id)
+        validation_result = run_design_rule_checks(design_asset_id, processor=processor_instance)
         design_asset.is_valid_geometry = validation_result['is_valid']
         design_asset.validation_report = validation_result
         design_asset.save()
@@ -142,11 +133,20 @@ def process_design_asset(self, design_asset_id):
         # Step 4: Extract BOM (if assembly file)
         TaskProgressTracker.update_progress(task_id, 4, 5, 'Extracting BOM structure...')
         try:
-            bom_result = extract_bom_from_assembly(design_asset_id)
+            bom_result = extract_bom_from_assembly(design_asset_id, processor=processor_instance)
             logger.info(f"BOM extraction result: {bom_result.get('bom_nodes_created', 0)} nodes created")
         except Exception as bom_error:
             logger.warning(f"BOM extraction failed (non-critical): {bom_error}")
         
+        # Clean up temp file once every step using the processor (and its
+        # source file, read again for STEP component names) has finished
+        if temp_file_path:
+            try:
+                os.unlink(temp_file_path)
+                logger.info(f"Cleaned up temp file: {temp_file_path}")
+            except Exception as cleanup_error:
+                logger.warning(f"Failed to cleanup temp file {temp_file_path}: {cleanup_error}")
+        
         # Step 5: Normalize units
         try:
             unit_result = normalize_units(design_asset_id)
@@ -310,9 +310,9 @@ def extract_geometry_metadata(design_asset_id):
         except (AttributeError, NotImplementedError):
             # For S3, download to temp file
             import tempfile
+            from designs.s3_service import download_to_file
             with tempfile.NamedTemporaryFile(delete=False, suffix=design_asset.filename) as tmp_file:
-                with design_asset.file.open('rb') as f:
-                    tmp_file.write(f.read())
+                download_to_file(design_asset.file, tmp_file)
                 file_path = tmp_file.name
                 temp_file_path = tmp_file.name  # Track for cleanup
                 logger.info(f"Downloaded S3 file to temp path: {file_path}")
@@ -410,9 +410,9 @@ def generate_web_preview(design_asset_id, processor=None):
                 file_path = design_asset.file.path
             except (AttributeError, NotImplementedError):
                 # For S3, download to temp file
+                from designs.s3_service import download_to_file
                 with tempfile.NamedTemporaryFile(delete=False, suffix=design_asset.filename) as tmp_file:
-                    with design_asset.file.open('rb') as f:
-                        tmp_file.write(f.read())
+                    download_to_file(design_asset.file, tmp_file)
                     file_path = tmp_file.name
                     temp_input_path = tmp_file.name
                     logger.info(f"Downloaded S3 file to temp path: {file_path}")
@@ -471,7 +471,7 @@ def generate_web_preview(design_asset_id, processor=None):
 
 
 @shared_task
-def run_design_rule_checks(design_asset_id):
+def run_design_rule_checks(design_asset_id, processor=None):
     """
     Run design rule checks (DRC) on geometry.
     
@@ -484,6 +484,7 @@ def run_design_rule_checks(design_asset_id):
     
     Args:
         design_asset_id: UUID of the DesignAsset
+        processor: Optional GeometryProcessor instance to reuse (performance optimization)
     
     Returns:
         dict: Validation results with is_valid flag and error list
@@ -506,23 +507,28 @@ def run_design_rule_checks(design_asset_id):
             logger.warning(f"No file attached to {design_asset_id}")
             return {'is_valid': False, 'errors': {'file': 'No file available for validation'}}
         
-        # Get file path (handle both local and S3 storage)
+        # Reuse existing processor or create new one
         temp_file_path = None
-        try:
-            file_path = design_asset.file.path
-        except (AttributeError, NotImplementedError):
-            # For S3, download to temp file
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=design_asset.filename) as tmp_file:
-                with design_asset.file.open('rb') as f:
-                    tmp_file.write(f.read())
-                file_path = tmp_file.name
-                temp_file_path = tmp_file.name
-                logger.info(f"Downloaded S3 file to temp path: {file_path}")
+        if processor:
+            logger.info("Reusing existing GeometryProcessor instance for DRC")
+        else:
+            # Get file path (handle both local and S3 storage)
+            try:
+                file_path = design_asset.file.path
+            except (AttributeError, NotImplementedError):
+                # For S3, download to temp file
+                import tempfile
+                from designs.s3_service import download_to_file
+                with tempfile.NamedTemporaryFile(delete=False, suffix=design_asset.filename) as tmp_file:
+                    download_to_file(design_asset.file, tmp_file)
+                    file_path = tmp_file.name
+                    temp_file_path = tmp_file.name
+                    logger.info(f"Downloaded S3 file to temp path: {file_path}")
+            
+            processor = GeometryProcessor(file_path)
         
-        # Run validation with GeometryProcessor
-        processor = GeometryProcessor(file_path)
-        validation = processor.run_design_rule_checks()
+        # Run validation; a reused processor already holds the topology counts
+        validation = processor.run_design_rule_checks(processor.extract_topology_info())
         
         # Clean up temp file if it was created
         if temp_file_path:
@@ -557,7 +563,7 @@ def run_design_rule_checks(design_asset_id):
 
 
 @shared_task
-def extract_bom_from_assembly(design_asset_id):
+def extract_bom_from_assembly(design_asset_id, processor=None):
     """
     Extract Bill of Materials from assembly file.
     
@@ -565,6 +571,7 @@ def extract_bom_from_assembly(design_asset_id):
     
     Args:
         design_asset_id: UUID of the DesignAsset
+        processor: Optional GeometryProcessor instance to reuse (performance optimization)
     
     Returns:
         dict: BOM extraction results
@@ -598,22 +605,27 @@ def extract_bom_from_assembly(design_asset_id):
             bom_job.save()
             return {'error': 'No file available'}
         
-        # Get file path (handle both local and S3 storage)
+        # Reuse existing processor or create new one
         temp_file_path = None
-        try:
-            file_path = design_asset.file.path
-        except (AttributeError, NotImplementedError):
-            # For S3, download to temp file
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=design_asset.filename) as tmp_file:
-                with design_asset.file.open('rb') as f:
-                    tmp_file.write(f.read())
-                file_path = tmp_file.name
-                temp_file_path = tmp_file.name
-                logger.info(f"Downloaded S3 file to temp path: {file_path}")
+        if processor:
+            logger.info("Reusing existing GeometryProcessor instance for BOM extraction")
+        else:
+            # Get file path (handle both local and S3 storage)
+            try:
+                file_path = design_asset.file.path
+            except (AttributeError, NotImplementedError):
+                # For S3, download to temp file
+                import tempfile
+                from designs.s3_service import download_to_file
+                with tempfile.NamedTemporaryFile(delete=False, suffix=design_asset.filename) as tmp_file:
+                    download_to_file(design_asset.file, tmp_file)
+                    file_path = tmp_file.name
+                    temp_file_path = tmp_file.name
+                    logger.info(f"Downloaded S3 file to temp path: {file_path}")
+            
+            processor = GeometryProcessor(file_path)
         
         # Extract BOM using GeometryProcessor
-        processor = GeometryProcessor(file_path)
         components = processor.extract_bom_structure()
         
         # Clean up temp file if it was created
@@ -629,6 +641,8 @@ def extract_bom_from_assembly(design_asset_id):
         
         # Create AssemblyNode tree from extracted components
         if components:
+            summary = summarize_bom_components(components)
+            
             # Create root assembly node
             root = AssemblyNode.add_root(
                 design_asset=design_asset,
@@ -636,17 +650,19 @@ def extract_bom_from_assembly(design_asset_id):
                 part_number=design_asset.series.part_number,
                 node_type='ASSEMBLY',
                 quantity=1,
-                mass=sum(comp.get('mass', 0) for comp in components),
-                volume=sum(comp.get('volume', 0) for comp in components),
+                mass=summary['total_mass'],
+                volume=summary['total_volume'],
                 component_metadata={
                     'is_root': True,
                     'component_count': len(components),
-                    'file_format': design_asset.filename.rsplit('.', 1)[-1].upper()
+                    'file_format': design_asset.filename.rsplit('.', 1)[-1].upper(),
+                    'center_of_mass': summary.get('center_of_mass', {}),
+                    'bounding_box': summary.get('bounding_box', {})
                 }
             )
             
             # Add component nodes as children
-            for comp in components:
+            for comp in components.to_dict_list():
                 child = root.add_child(
                     design_asset=design_asset,
                     name=comp['name'],
@@ -671,7 +687,7 @@ def extract_bom_from_assembly(design_asset_id):
                 'total_parts': len(components),
                 'total_mass': root.mass,
                 'total_volume': root.volume,
-                'components': components[:10]  # Only include first 10 for result summary
+                'components': components.to_dict_list(limit=10)  # Only include first 10 for result summary
             }
         else:
             # Single part, no assembly - create single node
@@ -937,14 +953,21 @@ def process_pending_notifications():
     from .notifications import EmailSender
     
     # Get pending notifications, prioritized
-    pending = EmailNotification.objects.filter(
-        status='PENDING'
-    ).filter(
-        models.Q(next_retry_at__isnull=True) | models.Q(next_retry_at__lte=timezone.now())
-    ).order_by(
+    ordering = (
         '-priority',  # HIGH before NORMAL
         'queued_at'   # Oldest first
-    )[:settings.NOTIFICATION_BATCH_SIZE]
+    )
+    batch_size = settings.NOTIFICATION_BATCH_SIZE
+    ready = EmailNotification.objects.filter(status='PENDING').order_by(*ordering)
+    
+    # Never-retried and due-for-retry rows are disjoint, so each branch is
+    # served by its own partial index instead of an OR over a nullable column
+    pending = ready.filter(
+        next_retry_at__isnull=True
+    )[:batch_size].union(
+        ready.filter(next_retry_at__lte=timezone.now())[:batch_size],
+        all=True
+    ).order_by(*ordering)[:batch_size]
     
     if not pending:
         logger.info("No pending notifications to process")
@@ -15,7 +15,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 logger = logging.getLogger(__name__)
 
-from .mixins import CachedViewSetMixin, LongtermCachedMixin, ShortCachedMixin
+from .mixins import CachedViewSetMixin, LongtermCachedMixin, ShortCachedMixin, serializer_columns
 
 from .models import (
     CustomUser, DesignSeries, DesignAsset, AssemblyNode,
@@ -94,6 +94,8 @@ class CustomUserViewSet(CachedViewSetMixin, viewsets.ReadOnlyModelViewSet):
     search_fields = ['username', 'email', 'first_name', 'last_name', 'organization']
     ordering_fields = ['username', 'date_joined', 'last_login']
     ordering = ['username']
+    # Same results for every authenticated user, no object permissions
+    cache_per_user = False
     
     @action(detail=False, methods=['get', 'patch', 'put'])
     def me(self, request):
@@ -135,10 +137,7 @@ class DesignSeriesViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
     Search: ?search=bracket (searches part_number, name, description)
     Ordering: ?ordering=-created_at (prefix with - for descending)
     """
-    queryset = DesignSeries.objects.annotate(
-        version_count=Count('versions'),
-        latest_version_number=Max('versions__version_number')
-    ).select_related('created_by').all()
+    queryset = DesignSeries.objects.with_version_stats().select_related('created_by')
     serializer_class = DesignSeriesSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -146,6 +145,8 @@ class DesignSeriesViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
     search_fields = ['part_number', 'name', 'description']
     ordering_fields = ['part_number', 'created_at', 'updated_at', 'status']
     ordering = ['-created_at']
+    # Same results for every authenticated user, no object permissions
+    cache_per_user = False
     
     def create(self, request, *args, **kwargs):
         """Create a new design series with detailed error logging."""
@@ -173,11 +174,15 @@ class DesignSeriesViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
     def versions(self, request, pk=None):
         """Get all versions for this series."""
         series = self.get_object()
-        versions = series.versions.all().order_by('-version_number')
+        # Load only the list serializer's columns, joining the uploader
+        versions = (
+            series.versions.select_related('series', 'uploaded_by')
+            .only(*serializer_columns(DesignAssetListSerializer, DesignAsset))
+            .order_by('-version_number')
+        )
         
         # Apply clearance filtering
-        if not request.user.is_us_person:
-            versions = versions.exclude(classification='ITAR')
+        versions = DesignAsset.filter_accessible(versions, request.user)
         
         serializer = DesignAssetListSerializer(versions, many=True)
         return Response(serializer.data)
@@ -218,6 +223,16 @@ class DesignAssetViewSet(CachedViewSetMixin, AuditLogMixin, viewsets.ModelViewSe
     ordering_fields = ['created_at', 'version_number', 'file_size', 'volume_mm3', 'mass_kg']
     ordering = ['-created_at']
     audit_resource_type = 'DesignAsset'
+    # Detail responses skip the processing error text
+    retrieve_only_fields = (
+        'id', 'series', 'version_number', 'uploaded_by', 'created_at', 'updated_at',
+        'processed_at', 'filename', 'file', 's3_key', 'file_size', 'file_hash',
+        'preview_file', 'preview_s3_key', 'classification', 'status',
+        'is_valid_geometry', 'validation_report', 'metadata', 'revision',
+        'description', 'tags',
+    )
+    # The nested series serializer reports its creator's username
+    retrieve_select_related_fields = ('series__created_by',)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -233,8 +248,7 @@ class DesignAssetViewSet(CachedViewSetMixin, AuditLogMixin, viewsets.ModelViewSe
         queryset = super().get_queryset()
         
         # If user is not a US person, exclude ITAR designs
-        if not user.is_us_person:
-            queryset = queryset.exclude(classification='ITAR')
+        queryset = DesignAsset.filter_accessible(queryset, user)
         
         # Optional: filter by series
         series_id = self.request.query_params.get('series')
@@ -459,15 +473,24 @@ class DesignAssetViewSet(CachedViewSetMixin, AuditLogMixin, viewsets.ModelViewSe
         Get hierarchical Bill of Materials.
         
         GET /api/designs/{id}/bom/
+        GET /api/designs/{id}/bom/?max_depth=2 - Nodes down to depth 2 only
         
         Returns complete BOM tree structure with nested components.
+        The tree is read in one query and handed to the serializer as a
+        parent-to-children map, so nesting costs no query per node.
         """
         design_asset = self.get_object()
         
-        # Get root nodes (top-level assemblies)
-        root_nodes = AssemblyNode.get_root_nodes().filter(design_asset=design_asset)
+        # Calculate tree statistics over the full tree in one query
+        all_nodes = AssemblyNode.objects.filter(design_asset=design_asset)
+        stats = all_nodes.aggregate(
+            total_nodes=Count('id'),
+            total_parts=Count('id', filter=Q(node_type='PART')),
+            total_assemblies=Count('id', filter=Q(node_type='ASSEMBLY')),
+            max_depth=Max('depth'),
+        )
         
-        if not root_nodes.exists():
+        if not stats['total_nodes']:
             return Response({
                 'design_asset_id': str(design_asset.id),
                 'message': 'No BOM data available. BOM extraction may still be processing.',
@@ -476,11 +499,20 @@ class DesignAssetViewSet(CachedViewSetMixin, AuditLogMixin, viewsets.ModelViewSe
                 'max_depth': 0
             })
         
-        # Calculate tree statistics
-        all_nodes = AssemblyNode.objects.filter(design_asset=design_asset)
-        total_parts = all_nodes.filter(node_type='PART').count()
-        total_assemblies = all_nodes.filter(node_type='ASSEMBLY').count()
-        max_depth = max([node.get_depth() for node in all_nodes], default=0)
+        # Load the (optionally depth-limited) tree in path order, so roots
+        # and each node's children come out in treebeard's sibling order
+        tree_nodes = all_nodes.order_by('path')
+        max_depth = request.query_params.get('max_depth')
+        if max_depth and max_depth.isdigit():
+            tree_nodes = tree_nodes.filter(depth__lte=int(max_depth))
+        
+        root_nodes = []
+        children_by_parent = {}
+        for node in tree_nodes:
+            if node.depth == 1:
+                root_nodes.append(node)
+            else:
+                children_by_parent.setdefault(node.path[:-node.steplen], []).append(node)
         
         # Calculate total mass
         total_mass = sum(node.get_total_mass() for node in root_nodes)
@@ -489,14 +521,14 @@ class DesignAssetViewSet(CachedViewSetMixin, AuditLogMixin, viewsets.ModelViewSe
             'design_asset_id': str(design_asset.id),
             'filename': design_asset.filename,
             'root_nodes': root_nodes,
-            'total_nodes': all_nodes.count(),
-            'total_parts': total_parts,
-            'total_assemblies': total_assemblies,
-            'max_depth': max_depth,
+            'total_nodes': stats['total_nodes'],
+            'total_parts': stats['total_parts'],
+            'total_assemblies': stats['total_assemblies'],
+            'max_depth': stats['max_depth'],
             'total_mass_kg': round(total_mass, 4),
         }
         
-        serializer = BOMTreeSerializer(response_data)
+        serializer = BOMTreeSerializer(response_data, context={'bom_children': children_by_parent})
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
@@ -655,8 +687,7 @@ class AssemblyNodeViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         
         # Filter out nodes from ITAR designs if user lacks clearance
-        if not user.is_us_person:
-            queryset = queryset.exclude(design_asset__classification='ITAR')
+        queryset = DesignAsset.filter_accessible(queryset, user, 'design_asset__')
         
         return queryset
 
@@ -709,8 +740,7 @@ class AnalysisJobViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(design_asset_id=design_asset_id)
         
         # Filter out ITAR jobs if user lacks clearance
-        if not user.is_us_person:
-            queryset = queryset.exclude(design_asset__classification='ITAR')
+        queryset = DesignAsset.filter_accessible(queryset, user, 'design_asset__')
         
         return queryset
     
@@ -911,8 +941,7 @@ class ReviewSessionViewSet(AuditLogMixin, viewsets.ModelViewSet):
         queryset = super().get_queryset()
         
         # Filter out ITAR design reviews if user lacks clearance
-        if not user.is_us_person:
-            queryset = queryset.exclude(design_asset__classification='ITAR')
+        queryset = DesignAsset.filter_accessible(queryset, user, 'design_asset__')
         
         return queryset
     
@@ -959,7 +988,7 @@ class ReviewSessionViewSet(AuditLogMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class MarkupViewSet(AuditLogMixin, viewsets.ModelViewSet):
+class MarkupViewSet(ShortCachedMixin, AuditLogMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing 3D annotations/comments on designs.
     
@@ -989,6 +1018,9 @@ class MarkupViewSet(AuditLogMixin, viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'resolved_at', 'priority', 'is_resolved']
     ordering = ['-created_at']
     audit_resource_type = 'Markup'
+    # Access follows the parent design's classification, which the markup's
+    # own detail generation does not track, so only lists are cached
+    cache_retrieve = False
     
     def get_queryset(self):
         """Filter markups based on review session access."""
@@ -1001,10 +1033,7 @@ class MarkupViewSet(AuditLogMixin, viewsets.ModelViewSet):
             queryset = queryset.filter(review_session_id=review_session_id)
         
         # Filter out ITAR markups if user lacks clearance
-        if not user.is_us_person:
-            queryset = queryset.exclude(
-                review_session__design_asset__classification='ITAR'
-            )
+        queryset = DesignAsset.filter_accessible(queryset, user, 'review_session__design_asset__')
         
         return queryset
     
@@ -66,10 +66,7 @@ MIDDLEWARE = [
     'designs.security_middleware.SecurityHeadersMiddleware',
     
     # Custom monitoring and error tracking middleware
-    'designs.middleware.ErrorTrackingMiddleware',
-    'designs.middleware.RequestLoggingMiddleware',
-    'designs.middleware.PerformanceMonitoringMiddleware',
-    'designs.middleware.MetricsMiddleware',
+    'designs.middleware.UnifiedRequestMiddleware',
 ]
 
 ROOT_URLCONF = 'enginel.urls'
@@ -277,6 +274,16 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Geometry Processing
+# OpenCASCADE threads for parallel meshing per worker process (0 = one per CPU).
+# Lower this when running several Celery worker processes on one host.
+GEOMETRY_MESH_THREADS = int(os.getenv('GEOMETRY_MESH_THREADS', '0'))
+# On-disk cache of processed CAD metadata, keyed by file contents. Disabled
+# by default; when enabled, point it outside the source tree (e.g.
+# /var/cache/enginel/cad). Entries are never evicted by the application, so
+# bound the directory externally (tmpfiles.d age rule, cron cleanup, etc.).
+CAD_CACHE_DIR = os.getenv('CAD_CACHE_DIR', '')
+
 # Django Auditlog Configuration
 AUDITLOG_INCLUDE_ALL_MODELS = False  # We're using custom AuditLog model
 
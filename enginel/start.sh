@@ -7,6 +7,7 @@ python manage.py migrate --noinput
 echo "Creating superuser..."
 python manage.py shell << EOF
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 import os
 
 User = get_user_model()
@@ -14,8 +15,18 @@ username = os.environ.get('DJANGO_SUPERUSER_USERNAME', 'admin')
 email = os.environ.get('DJANGO_SUPERUSER_EMAIL', 'admin@example.com')
 password = os.environ.get('DJANGO_SUPERUSER_PASSWORD', 'admin')
 
+# Containers starting together can race between the check and the insert;
+# the unique username constraint decides, and the loser reports "exists"
+created = False
 if not User.objects.filter(username=username).exists():
-    User.objects.create_superuser(username=username, email=email, password=password)
+    try:
+        with transaction.atomic():
+            User.objects.create_superuser(username=username, email=email, password=password)
+        created = True
+    except IntegrityError:
+        pass
+
+if created:
     print(f'Superuser "{username}" created successfully!')
 else:
     print(f'Superuser "{username}" already exists.')